@@ -0,0 +1,544 @@
+import sys
+import os
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import socket
+import subprocess
+import urllib.request
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, FileSystemLoader
+
+import generate
+from generate import NS, TTL_CONFIG, ProjectPaths, BuildOptions, BuildManifest
+
+# ==============================================================================
+# 1. CONFIGURATIE
+# ==============================================================================
+
+BENCH_CONFIG = {
+    "sizes": (1_000, 10_000, 100_000),
+    "seed": 42,
+    "per_file": 1_000,                 # Begrippen per synthetisch TTL-bestand (zoals de Cx-bestanden)
+    "output": os.path.join(".cache", "benchmark", "resultaat.json"),
+    "startup_commands": ("import", "validate", "index", "export"),
+    "startup_repeat": 5,
+    "service_requests": 200,           # Verzoeken per scenario in de belastingstest van de autolink-dienst
+    "service_batches": (1, 10, 100),   # Teksten per POST /autolink
+    "service_concurrency": 4,
+    "stream_sizes": (2_000, 8_000),    # --stream: twee groottes, zodat de grens ook de groei met het kader toetst
+    # Absolute grens voor de piek-RSS van index + export met --stream, bovenop de kale import:
+    # vast + skelet per begrip + een factor maal het grootste bronbestand (de graaf die tegelijk in geheugen is)
+    "stream_rss_fixed_mb": 50,         # rdflib-import en werkgeheugen van de exports (SQLite/JSON)
+    "stream_rss_concept_kb": 8,        # records, lookup en hiërarchie per begrip
+    "stream_rss_source_factor": 100,   # MB RSS per MB TTL van het grootste bronbestand
+}
+
+# Bouwstenen voor Nederlandstalige labels in de stijl van het begrippenkader
+WOORDSTAMMEN = [
+    "aansluit", "net", "meet", "energie", "gas", "stroom", "transport", "klant", "storing", "onderhoud",
+    "capaciteit", "leverings", "allocatie", "verbruiks", "invoedings", "spannings", "druk", "kabel",
+    "leiding", "station", "transformator", "meter", "contract", "tarief", "factuur", "markt", "balans",
+    "congestie", "reserve", "productie", "opslag", "warmte", "waterstof", "werk", "graaf", "schakel",
+    "beveiligings", "register", "profiel", "data",
+]
+KERNWOORDEN = [
+    "punt", "kabel", "leiding", "station", "installatie", "contract", "overeenkomst", "verbruik", "register",
+    "waarde", "gegeven", "proces", "melding", "opdracht", "plan", "vergunning", "rapport", "regeling",
+    "dienst", "product", "partij", "gebied", "capaciteit", "verlies", "onderbreking", "aanvraag",
+    "verbinding", "component", "eenheid", "periode",
+]
+BIJVOEGLIJK = [
+    "ondergrondse", "tijdelijke", "aanvullende", "centrale", "decentrale", "fysieke", "administratieve",
+    "geplande", "actieve", "passieve", "regionale", "lokale", "digitale", "technische", "commerciële",
+    "verwachte", "maximale", "minimale", "gecontracteerde", "beschikbare",
+]
+ZINSDELEN = [
+    "waarmee de netbeheerder {ander} beheert",
+    "dat nodig is voor het uitvoeren van {ander}",
+    "die betrekking heeft op {ander} bij een aansluiting",
+    "zoals vastgelegd in de {ander}",
+    "waarbij {ander} wordt vastgesteld door de netbeheerder",
+    "ten behoeve van {ander} in het distributienet",
+]
+
+PREFIXEN = {
+    "": TTL_CONFIG["prefix"],
+    "adms": str(NS["adms"]),
+    "dct": str(NS["dct"]),
+    "foaf": str(NS["foaf"]),
+    "iso": str(NS["iso"]),
+    "rdfs": str(NS["rdfs"]),
+    "skos": str(NS["skos"]),
+    "status": "https://inspire.ec.europa.eu/registry/status/",
+}
+
+# ==============================================================================
+# 2. SYNTHETISCH BEGRIPPENKADER
+# ==============================================================================
+
+def ttl_string(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"@nl'
+
+def make_labels(rng: random.Random, n: int) -> List[str]:
+    """`n` unieke, realistisch ogende Nederlandse voorkeurstermen (samenstellingen met bijvoeglijk naamwoord)."""
+    labels, seen = [], set()
+    while len(labels) < n:
+        stems = rng.sample(WOORDSTAMMEN, rng.choice((1, 1, 2)))
+        label = "".join(stems) + rng.choice(KERNWOORDEN)
+        if rng.random() < 0.4:
+            label = f"{rng.choice(BIJVOEGLIJK)} {label}"
+        if label not in seen:
+            seen.add(label)
+            labels.append(label)
+    return labels
+
+def synthetic_vocabulary(target: str, size: int, seed: int = BENCH_CONFIG["seed"], per_file: int = BENCH_CONFIG["per_file"]) -> List[str]:
+    """Schrijft een NL-SBB-conform begrippenkader van `size` begrippen naar `target` (één TTL per `per_file` begrippen).
+
+    Elk begrip heeft een voorkeursterm, een definitie die naar andere begrippen verwijst, status,
+    bron en schema; een deel krijgt alternatieve termen, zoektermen, toelichtingen en broader-,
+    related- en partitieve relaties. Zelfde `seed` = identieke bestanden.
+    """
+    rng = random.Random(seed)
+    labels = make_labels(rng, size)
+    refs = [f"b{i:06d}" for i in range(size)]
+    sources = [f"bron{i:02d}" for i in range(10)]
+    prefixes = "".join(f"@prefix {p}: <{ns}> .\n" for p, ns in PREFIXEN.items())
+    header = f"@base <{TTL_CONFIG['base']}> .\n{prefixes}\n"
+    os.makedirs(target, exist_ok=True)
+
+    files = [os.path.join(target, "00-kader.ttl"), os.path.join(target, "01-bronnen.ttl")]
+    with open(files[0], "w", encoding="utf-8") as f:
+        f.write(header)
+        f.write(f"<> a skos:ConceptScheme ;\n    dct:title {ttl_string(f'Synthetisch begrippenkader ({size} begrippen)')} ;\n"
+                f"    rdfs:comment {ttl_string('Gegenereerd voor benchmarks.')} .\n")
+    with open(files[1], "w", encoding="utf-8") as f:
+        f.write(header)
+        for i, source in enumerate(sources):
+            f.write(f":{source} a foaf:Document ;\n    dct:title {ttl_string(f'Netcode deel {i + 1}')} ;\n"
+                    f"    foaf:page <https://wetten.overheid.nl/bron/{source}> .\n\n")
+
+    roots = max(1, size // 100)
+    for start in range(0, size, per_file):
+        path = os.path.join(target, f"C{start // per_file + 1:03d}-synthetisch.ttl")
+        files.append(path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(header)
+            for i in range(start, min(start + per_file, size)):
+                other = lambda: labels[rng.randrange(size)]
+                broader = rng.randrange(i) if i >= roots else None
+                genus = labels[broader].split(" ")[-1] if broader is not None else "object"
+                props = [
+                    "a skos:Concept",
+                    f"dct:source :{rng.choice(sources)}",
+                    f"skos:definition {ttl_string(f'{genus} ' + rng.choice(ZINSDELEN).format(ander=other()))}",
+                    "skos:inScheme <>",
+                    f"skos:prefLabel {ttl_string(labels[i])}",
+                    "adms:status status:valid",
+                ]
+                if broader is None:
+                    props.append("skos:topConceptOf <>")
+                else:
+                    props.append(f"skos:broader :{refs[broader]}")
+                if rng.random() < 0.15:
+                    props.append(f"skos:altLabel {ttl_string(labels[i].replace(' ', '-') + 'en')}")
+                if rng.random() < 0.02:
+                    props.append(f"skos:hiddenLabel {ttl_string(labels[i].upper())}")
+                if rng.random() < 0.1:
+                    props.append(f"skos:scopeNote {ttl_string(f'Niet te verwarren met {other()} of {other()}.')}")
+                if rng.random() < 0.1:
+                    props.append(f"skos:related :{refs[rng.randrange(size)]}")
+                if broader is not None and rng.random() < 0.05:
+                    props.append(f"iso:broaderPartitive :{refs[rng.randrange(broader + 1)]}")
+                f.write(f":{refs[i]} " + " ;\n    ".join(props) + " .\n\n")
+    return files
+
+# ==============================================================================
+# 3. METEN
+# ==============================================================================
+
+class PhaseTimer:
+    """Verzamelt de wandkloktijd per fase (in seconden, in volgorde van uitvoering)."""
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    def run(self, name: str, func, *args, **kwargs):
+        print(f"   {name:<12}", end="", flush=True)
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        self.phases[name] = round(time.perf_counter() - started, 4)
+        print(f"{self.phases[name]:9.3f} s")
+        return result
+
+def local_shapes(shapes: Optional[str]) -> Optional[str]:
+    """Pad naar een lokaal SHACL-profiel: `--shapes` of de kopie die een normale build in de cache zette."""
+    if shapes: return shapes
+    source = TTL_CONFIG["shacl_profile"].format(versie=TTL_CONFIG["shacl_versie"])
+    if os.path.exists(source): return source
+    _, cached = generate.cached_shapes_path(ProjectPaths(root=""))
+    return cached if os.path.exists(cached) else None
+
+def bench_size(size: int, workdir: str, options: BuildOptions, shapes: Optional[str], seed: int) -> dict:
+    """Eén volledige koude run (lege caches) over een synthetisch kader van `size` begrippen."""
+    root = os.path.join(workdir, str(size))
+    paths = ProjectPaths(root=os.path.join(root, "site"), ttl_source=os.path.join(root, "begrippenkader"),
+                         cache=os.path.join(root, ".cache"))
+    started = time.perf_counter()
+    files = synthetic_vocabulary(paths.ttl_source, size, seed)
+    print(f"== {size} begrippen ({len(files)} bestanden, {time.perf_counter() - started:.1f} s aangemaakt)")
+
+    timer = PhaseTimer()
+    graph, store = timer.run("laden", generate.load_vocabulary, paths, options.jobs)
+    if shapes:
+        TTL_CONFIG["shacl_profile"] = shapes
+        valid, _ = timer.run("validatie", generate.validate_sources, graph, paths)
+        if not valid: print("   LET OP: synthetisch kader voldoet niet aan het SHACL-profiel.")
+    else:
+        print("   validatie   overgeslagen (geen lokaal SHACL-profiel; geef --shapes of draai eerst een build)")
+    lookup = timer.run("index", generate.build_index, store)
+    linker = timer.run("compileren", generate.make_linker, lookup, paths, options)
+    pages = timer.run("verwerken", generate.process_concepts, store, store.concepts, lookup, linker)
+
+    env = Environment(loader=FileSystemLoader(paths.templates))
+    manifest = BuildManifest(paths.output_manifest, paths.root)
+    renderer = generate.PageRenderer(store, lookup, paths, options, linker)
+    def render():
+        for path, digest, content in map(renderer.render_data, pages):
+            manifest.write(path, digest, lambda: content)
+    timer.run("renderen", render)
+    timer.run("aliassen", generate.write_aliases, env, lookup, paths, manifest)
+    timer.run("nav", generate.write_nav, lookup, paths, manifest)
+    timer.run("navboom", generate.write_nav_tree, store, lookup, paths, manifest)
+    timer.run("zoekindex", generate.write_search_index, store, lookup, paths, manifest)
+    timer.run("exports", generate.write_exports, graph, store, lookup, paths, manifest)
+
+    return {
+        "begrippen": len(store.concepts),
+        "triples": len(graph),
+        "bestanden": len(files),
+        "geschreven": manifest.written,
+        "fasen": timer.phases,
+        "totaal": round(sum(timer.phases.values()), 4),
+    }
+
+# Draait in een vers proces, zodat interpreterstart en imports meetellen zoals bij een editor die `validate` aanroept
+STARTUP_SCRIPT = """
+import sys, time, json
+started = time.perf_counter()
+repo, command, root, shapes = sys.argv[1:5]
+sys.path.insert(0, repo)
+import generate
+imported = time.perf_counter() - started
+if command != "import":
+    if shapes: generate.TTL_CONFIG["shacl_profile"] = shapes
+    generate.main([command, root, "--incremental"])
+print(json.dumps({"import_s": imported, "geladen": [m for m in ("spacy", "pyshacl", "pattern") if m in sys.modules]}))
+"""
+
+def bench_startup(workdir: str, shapes: Optional[str], repeat: int = BENCH_CONFIG["startup_repeat"]) -> dict:
+    """Opstarttijd per subcommando op het echte begrippenkader: eerste (koude) run en mediaan van de rest."""
+    repo = os.path.dirname(os.path.abspath(__file__))
+    shutil.copytree(os.path.join(repo, "begrippenkader"), os.path.join(workdir, "begrippenkader"))
+    
+    results = {}
+    for command in BENCH_CONFIG["startup_commands"]:
+        if command == "validate" and not shapes:
+            print("   validate    overgeslagen (geen lokaal SHACL-profiel; geef --shapes of draai eerst een build)")
+            continue
+        times, last = [], {}
+        for _ in range(repeat):
+            started = time.perf_counter()
+            proc = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, repo, command, "site", shapes or ""],
+                                  cwd=workdir, capture_output=True, text=True)
+            times.append(time.perf_counter() - started)
+            if proc.returncode != 0:
+                print(proc.stdout, proc.stderr); raise SystemExit(f"FOUT: '{command}' faalde in de opstartmeting.")
+            last = json.loads(proc.stdout.strip().splitlines()[-1])
+        warm = sorted(times[1:] or times)
+        results[command] = {"eerste_s": round(times[0], 4), "mediaan_s": round(warm[len(warm) // 2], 4),
+                            "import_s": round(last["import_s"], 4), "geladen": last["geladen"]}
+        print(f"   {command:<12}{times[0]:8.3f} s eerste {results[command]['mediaan_s']:8.3f} s mediaan"
+              f"   (import {last['import_s']:.3f} s; geladen: {', '.join(last['geladen']) or '-'})")
+    return results
+
+# Draait per modus en stap in een vers proces, zodat de piek-RSS alleen die stap meet. `index` en
+# `export` laden geen spaCy: daar bepaalt de graaf het geheugen. `pages` draait apart, alleen voor de uitvoer.
+STREAM_SCRIPT = """
+import sys, json
+repo, root, stream, commands = sys.argv[1:5]
+sys.path.insert(0, repo)
+import generate
+for command in filter(None, commands.split(",")):
+    generate.main([command, root] + (["--stream"] if stream == "1" else []))
+print(json.dumps(generate.peak_rss_mb()))
+"""
+
+def output_files(root: str) -> Dict[str, str]:
+    """Relatief pad -> absoluut pad voor alle uitvoerbestanden onder `root`."""
+    files = {}
+    for folder, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(folder, name)
+            files[os.path.relpath(path, root)] = path
+    return files
+
+def stream_rss_limit(base: float, size: int, largest: int) -> float:
+    """Grens (MB) voor de piek-RSS van index + export met --stream: kale import + vast + skelet + grootste bron."""
+    return round(base + BENCH_CONFIG["stream_rss_fixed_mb"] + BENCH_CONFIG["stream_rss_concept_kb"] * size / 1024
+                 + BENCH_CONFIG["stream_rss_source_factor"] * largest / 1024 ** 2, 1)
+
+def bench_stream(size: int, workdir: str, seed: int, max_rss: Optional[float] = None, compare: bool = True) -> dict:
+    """Bouw hetzelfde synthetische kader volledig en per bronbestand (--stream) en vergelijk uitvoer en piek-RSS.
+
+    Pagina's, nav, zoekindex en JSON/SQLite-exports moeten byte-identiek zijn; de RDF-exports
+    worden per bron geserialiseerd en hoeven alleen isomorf te zijn (`compare=False` slaat pages en
+    de vergelijking over). De RSS-grens geldt voor index + export (zonder spaCy): absoluut met
+    `max_rss`, anders `stream_rss_limit`, die met het grootste bronbestand schaalt en alleen met het
+    skelet per begrip meegroeit. De volledige build wordt ter vergelijking ook gemeten.
+    """
+    from rdflib import Graph
+    from rdflib.compare import isomorphic
+
+    root = os.path.join(workdir, f"stream-{size}")
+    files = synthetic_vocabulary(os.path.join(root, "begrippenkader"), size, seed)
+    print(f"== {size} begrippen ({len(files)} bestanden), volledig vs. --stream")
+    repo = os.path.dirname(os.path.abspath(__file__))
+    templates = ProjectPaths(root="").templates
+    shutil.copytree(os.path.join(repo, templates), os.path.join(root, templates))
+
+    def run(mode: str, flag: str, commands: str) -> float:
+        proc = subprocess.run([sys.executable, "-c", STREAM_SCRIPT, repo, mode, flag, commands], cwd=root, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(proc.stdout, proc.stderr); raise SystemExit(f"FOUT: de {mode}e build faalde.")
+        return json.loads(proc.stdout.strip().splitlines()[-1])["proces"]
+
+    base = run("kaal", "0", "")
+    largest = max(os.path.getsize(path) for path in files)
+    rss, graph, pages, times = {}, {}, {}, {}
+    for mode, flag in (("volledig", "0"), ("stream", "1")):
+        started = time.perf_counter()
+        rss[mode] = run(mode, flag, "index,export")
+        if compare: pages[mode] = run(mode, flag, "pages")
+        times[mode] = round(time.perf_counter() - started, 4)
+        graph[mode] = round(rss[mode] - base, 1)
+        print(f"   {mode:<12}{times[mode]:8.3f} s   piek-RSS index+export {rss[mode]} MB (graafdeel {graph[mode]} MB)"
+              + (f", pages {pages[mode]} MB" if compare else ""))
+
+    full, stream = output_files(os.path.join(root, "volledig")), output_files(os.path.join(root, "stream"))
+    rdf_formats = {".ttl": "turtle", ".nt": "nt", ".jsonld": "json-ld"}
+    rdf = [name for name in full if os.path.splitext(name)[1] in rdf_formats and os.path.dirname(name) == ""]
+    # RDF-exports, hun .gz/.br-varianten en wat hun checksums bevat verschillen per serialisatie
+    names = ProjectPaths(root="")
+    skip = {n for n in full if n.startswith(tuple(rdf))} | {names.output_checksums, names.output_manifest}
+
+    problems = sorted(set(full) ^ set(stream)) if compare else []
+    for name in sorted(set(full) & set(stream) - skip) if compare else ():
+        with open(full[name], "rb") as a, open(stream[name], "rb") as b:
+            if a.read() != b.read(): problems.append(name)
+    for name in rdf if compare else ():
+        fmt = rdf_formats[os.path.splitext(name)[1]]
+        if not isomorphic(Graph().parse(full[name], format=fmt), Graph().parse(stream[name], format=fmt)):
+            problems.append(name)
+
+    limit = max_rss if max_rss is not None else stream_rss_limit(base, size, largest)
+    if problems:
+        print(f"   FOUT: {len(problems)} bestanden verschillen, bv. {', '.join(problems[:5])}")
+    elif compare:
+        print(f"   Uitvoer gelijk ({len(full)} bestanden; {len(rdf)} RDF-exports isomorf)")
+    if rss["stream"] > limit:
+        print(f"   FOUT: piek-RSS van --stream ({rss['stream']} MB) boven de grens van {limit} MB")
+    else:
+        print(f"   piek-RSS van --stream ({rss['stream']} MB) binnen de grens van {limit} MB"
+              f" (grootste bronbestand {largest / 1024 ** 2:.2f} MB)")
+
+    return {"begrippen": size, "bestanden": len(files), "grootste_bron_mb": round(largest / 1024 ** 2, 2), "tijd_s": times,
+            "kale_import_rss_mb": base, "piek_rss_mb": rss, "graafdeel_mb": graph, "pages_rss_mb": pages, "grens_mb": limit,
+            "verschillen": problems, "geslaagd": not problems and rss["stream"] <= limit}
+
+def wait_for_service(url: str, proc: Optional[subprocess.Popen], timeout: float = 300) -> dict:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise SystemExit("FOUT: de autolink-dienst is gestopt voordat hij klaar was.")
+        try:
+            with urllib.request.urlopen(f"{url}/status", timeout=5) as response:
+                return json.load(response)
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"FOUT: autolink-dienst op {url} niet bereikbaar.")
+
+def bench_service(url: Optional[str], requests: int = BENCH_CONFIG["service_requests"],
+                  concurrency: int = BENCH_CONFIG["service_concurrency"]) -> dict:
+    """Latentie en doorvoer van `generate.py serve` met definities uit het echte begrippenkader.
+    
+    Zonder `url` wordt de dienst zelf gestart (opstarttijd telt niet mee in de verzoeken).
+    """
+    repo = os.path.dirname(os.path.abspath(__file__))
+    _, store = generate.load_vocabulary(ProjectPaths(root="", ttl_source=os.path.join(repo, "begrippenkader")))
+    labels = [c.first(NS["skos"].prefLabel) for c in store.concepts if c.first(NS["skos"].prefLabel)]
+    texts = [c.first(NS["skos"].definition) for c in store.concepts if c.first(NS["skos"].definition)]
+    
+    proc = None
+    if not url:
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, os.path.join(repo, "generate.py"), "serve", "--port", str(port)],
+                                cwd=repo)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        status = wait_for_service(url, proc)
+        results = {"begrippen": status["begrippen"]}
+        if proc is not None:
+            results["opstart_s"] = round(time.perf_counter() - started, 3)
+            print(f"   opstart      {results['opstart_s']:8.3f} s")
+        
+        def lookup(i: int):
+            with urllib.request.urlopen(f"{url}/lookup?label={quote(labels[i % len(labels)])}") as response:
+                response.read()
+        def autolink(size: int):
+            def call(i: int):
+                batch = [texts[(i * size + j) % len(texts)] for j in range(size)]
+                request = urllib.request.Request(f"{url}/autolink", data=json.dumps({"teksten": batch}).encode("utf-8"),
+                                                 headers={"Content-Type": "application/json"})
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+            return call
+        
+        scenarios = [("lookup", lookup)] + [(f"autolink x{n}", autolink(n)) for n in BENCH_CONFIG["service_batches"]]
+        for name, call in scenarios:
+            def timed(i: int) -> float:
+                started = time.perf_counter()
+                call(i)
+                return time.perf_counter() - started
+            started = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as pool:
+                latencies = sorted(pool.map(timed, range(requests)))
+            elapsed = time.perf_counter() - started
+            results[name] = {"p50_ms": round(latencies[len(latencies) // 2] * 1000, 2),
+                             "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+                             "per_s": round(requests / elapsed, 1)}
+            print(f"   {name:<13}{results[name]['p50_ms']:8.2f} ms p50 {results[name]['p95_ms']:8.2f} ms p95"
+                  f" {results[name]['per_s']:8.1f} verzoeken/s")
+        return results
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: dict, baseline_path: str, startup: Optional[dict] = None, service: Optional[dict] = None):
+    """Print per fase de verhouding tot een eerder resultaatbestand (>1 = trager)."""
+    baseline = generate.read_json(baseline_path, {}).get("resultaten", {})
+    print(f"\n=== Vergelijking met {baseline_path} ({generate.read_json(baseline_path, {}).get('commit')}) ===")
+    for size, result in results.items():
+        before = baseline.get(size)
+        if not before: continue
+        print(f"{size} begrippen:")
+        for phase, seconds in result["fasen"].items():
+            if before["fasen"].get(phase):
+                print(f"   {phase:<12}{before['fasen'][phase]:9.3f} -> {seconds:9.3f} s  (x{seconds / before['fasen'][phase]:.2f})")
+    
+    before_startup = generate.read_json(baseline_path, {}).get("opstart", {})
+    for command, result in (startup or {}).items():
+        if command in before_startup:
+            print(f"   opstart {command:<10}{before_startup[command]['mediaan_s']:9.3f} -> {result['mediaan_s']:9.3f} s")
+    
+    before_service = generate.read_json(baseline_path, {}).get("dienst", {})
+    for name, result in (service or {}).items():
+        if isinstance(result, dict) and name in before_service:
+            print(f"   dienst {name:<11}{before_service[name]['p50_ms']:9.2f} -> {result['p50_ms']:9.2f} ms p50")
+
+# ==============================================================================
+# 4. MAIN
+# ==============================================================================
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark van generate.py op synthetische begrippenkaders (volledig offline)")
+    parser.add_argument("--sizes", help="Kommagescheiden aantallen begrippen (standaard: "
+                        f"{','.join(map(str, BENCH_CONFIG['sizes']))}; met --stream {','.join(map(str, BENCH_CONFIG['stream_sizes']))})")
+    parser.add_argument("--seed", type=int, default=BENCH_CONFIG["seed"])
+    parser.add_argument("--shapes", help="Lokaal SHACL-profiel (standaard: de gecachte kopie uit .cache/shacl)")
+    parser.add_argument("--output", default=BENCH_CONFIG["output"], help="JSON-bestand voor de resultaten")
+    parser.add_argument("--baseline", help="Eerder resultaatbestand om mee te vergelijken")
+    parser.add_argument("--engine", choices=generate.ContentLinker.ENGINES, default=generate.NLP_CONFIG["engine"])
+    parser.add_argument("--jobs", type=int, default=1, help="Processen voor het inlezen van de bronbestanden")
+    parser.add_argument("--keep", action="store_true", help="Werkmap met synthetische bronnen en uitvoer bewaren")
+    parser.add_argument("--startup", action="store_true",
+                        help="Meet alleen de opstarttijd per subcommando van generate.py (op het echte begrippenkader)")
+    parser.add_argument("--service", action="store_true",
+                        help="Belastingstest van de autolink-dienst (generate.py serve) in plaats van de synthetische kaders")
+    parser.add_argument("--stream", action="store_true",
+                        help="Vergelijk per grootte de volledige build met --stream: gelijke uitvoer en lagere piek-RSS")
+    parser.add_argument("--max-rss", type=float, metavar="MB",
+                        help="Absolute grens voor de piek-RSS van index + export met --stream "
+                             "(standaard: kale import + vast + skelet per begrip + factor maal het grootste bronbestand)")
+    parser.add_argument("--service-url", help="Een al draaiende dienst testen, bv. http://127.0.0.1:8750")
+    parser.add_argument("--requests", type=int, default=BENCH_CONFIG["service_requests"], help="Verzoeken per scenario")
+    parser.add_argument("--concurrency", type=int, default=BENCH_CONFIG["service_concurrency"], help="Gelijktijdige verzoeken")
+    args = parser.parse_args(argv)
+    if args.sizes is None:
+        args.sizes = ",".join(map(str, BENCH_CONFIG["stream_sizes" if args.stream else "sizes"]))
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    options = BuildOptions(engine=args.engine, jobs=args.jobs)
+    shapes = local_shapes(args.shapes)
+    workdir = tempfile.mkdtemp(prefix="begrippen-bench-")
+
+    results, startup, service, stream = {}, None, None, None
+    try:
+        if args.service:
+            print("== Autolink-dienst")
+            service = bench_service(args.service_url, args.requests, args.concurrency)
+        elif args.startup:
+            print("== Opstarttijd per subcommando")
+            startup = bench_startup(workdir, shapes)
+        elif args.stream:
+            stream = {size: bench_stream(int(size), workdir, args.seed, args.max_rss) for size in args.sizes.split(",")}
+        else:
+            for size in (int(s) for s in args.sizes.split(",")):
+                results[str(size)] = bench_size(size, workdir, options, shapes, args.seed)
+    finally:
+        if args.keep: print(f"Werkmap bewaard: {workdir}")
+        else: shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "commit": git_commit(),
+        "tijdstip": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "engine": args.engine,
+        "resultaten": results,
+    }
+    if startup is not None: report["opstart"] = startup
+    if service is not None: report["dienst"] = service
+    if stream is not None: report["stream"] = stream
+    generate.ensure_dir(args.output)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Resultaten: {args.output}")
+
+    if args.baseline: compare(results, args.baseline, startup, service)
+    if stream is not None and not all(result["geslaagd"] for result in stream.values()):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -8,28 +8,49 @@ document.addEventListener("DOMContentLoaded", function() {
     const btn = document.getElementById('btn-toggle-nav');
     const loadingContainer = document.getElementById('skos-loading-container');
     const loadingMsg = document.getElementById('skos-loading-msg');
+    const filterInput = document.getElementById('skos-az-filter');
+    const lettersBar = document.getElementById('skos-az-letters');
+    const itemsList = document.getElementById('skos-az-items');
 
-    let dataLoaded = false;
-    const jsonUrl = `${baseUrl}/assets/json/alphabetical-nav.json`;
+    // Nav: per beginletter een shard; zoeken: geshardde inverted index (zie generate.py)
+    const navUrl = `${baseUrl}/assets/json/nav`;
+    const searchUrl = `${baseUrl}/assets/json/zoek`;
+    const MAX_RESULTS = 50;
 
-    function scrollToActive() {
-        const activeLink = azList.querySelector('.active');
-        if (activeLink) activeLink.scrollIntoView({block: 'center'}); 
+    let navIndex = null;
+    let currentLetter = null;
+    const cache = new Map(); // url -> Promise<json>
+
+    function fetchJson(url) {
+        if (!cache.has(url)) cache.set(url, fetch(url).then(response => response.json()));
+        return cache.get(url);
     }
 
-    function loadAndRenderData() {
-        if (dataLoaded) return;
+    // Zelfde vouwing als get_normalized_sort_key/search_tokens: kleine letters, zonder accenten
+    function fold(text) {
+        return text.normalize('NFD').replace(/\p{Mn}/gu, '').toLowerCase();
+    }
 
-        fetch(jsonUrl)
-        .then(response => response.json())
-        .then(data => {
-            const currentPath = window.location.pathname.replace(/\/$/, "");
+    function tokenize(text) {
+        return fold(text).match(/[\p{L}\p{N}]+/gu) || [];
+    }
 
-            let listHTML = "";
+    function shardKey(folded, length) {
+        const key = folded.slice(0, length);
+        return /^[a-z0-9]+$/.test(key) ? key : '_';
+    }
 
-            data.forEach(item => {
+    function currentPath() {
+        return window.location.pathname.replace(/\/$/, "");
+    }
+
+    function renderItems(items) {
+        const path = currentPath();
+        let listHTML = "";
+
+        items.forEach(item => {
             const itemUrlClean = item.url.replace(/\/$/, "");
-            const isActive = item.type !== 'alias' && currentPath.endsWith(itemUrlClean);
+            const isActive = item.type !== 'alias' && path.endsWith(itemUrlClean);
             let cssClass = 'nav-list-link';
             if (isActive) cssClass += ' active';
 
@@ -39,34 +60,135 @@ document.addEventListener("DOMContentLoaded", function() {
             listHTML += '<li class="nav-list-item">';
             listHTML += `<a href="${baseUrl}${item.url}" class="${cssClass}">${itemHTML}</a>`;
             listHTML += '</li>';
-            });
+        });
 
-            azList.innerHTML = listHTML;
-            loadingContainer.style.display = 'none';
-            dataLoaded = true;
+        itemsList.innerHTML = listHTML || '<li class="nav-list-item"><span class="nav-list-link">Geen begrippen gevonden</span></li>';
+    }
+
+    function scrollToActive() {
+        const activeLink = itemsList.querySelector('.active');
+        if (activeLink) activeLink.scrollIntoView({block: 'center'});
+    }
+
+    function showError(err) {
+        loadingContainer.style.display = 'block';
+        loadingMsg.textContent = "Fout bij laden begrippenlijst";
+        console.error(err);
+    }
+
+    // --- Alfabetisch: alleen de shard van de gekozen letter laden ---
+
+    function showLetter(letter) {
+        const entry = navIndex.find(e => e.letter === letter) || navIndex[0];
+        if (!entry) return Promise.resolve();
+        currentLetter = entry.letter;
+        lettersBar.querySelectorAll('a').forEach(a => a.classList.toggle('active', a.dataset.letter === entry.letter));
+
+        return fetchJson(`${navUrl}/${entry.letter}.json?v=${entry.v}`).then(items => {
+            if (filterInput.value.trim()) return; // Intussen gezocht: zoekresultaten laten staan
+            renderItems(items);
             scrollToActive();
+        });
+    }
+
+    function loadAndRenderData() {
+        if (navIndex) return;
+
+        fetchJson(`${navUrl}/index.json`)
+        .then(index => {
+            navIndex = index;
+            lettersBar.innerHTML = index.map(e =>
+                `<a href="#" data-letter="${e.letter}" title="${e.aantal} termen">${e.letter === '_' ? '#' : e.letter.toUpperCase()}</a>`
+            ).join(' ');
+            loadingContainer.style.display = 'none';
+
+            // Begin bij de letter van de huidige pagina
+            const heading = document.querySelector('#main-content h1');
+            return showLetter(heading ? shardKey(fold(heading.textContent.trim()), 1) : null);
         })
-        .catch(err => {
-            loadingMsg.textContent = "Fout bij laden begrippenlijst";
-            console.error(err);
+        .catch(showError);
+    }
+
+    // --- Zoeken: alleen de index-shards van de eerste tekens van elk zoekwoord laden ---
+
+    function searchTerm(index, token) {
+        // Postings van alle tokens die met `token` beginnen; exacte treffers tellen dubbel
+        const keys = Object.keys(index.shards).filter(key =>
+            key === shardKey(token, index.prefix) || (token.length < index.prefix && key.startsWith(token)));
+
+        return Promise.all(keys.map(key => fetchJson(`${searchUrl}/t-${key}.json?v=${index.shards[key]}`)))
+        .then(shards => {
+            const scores = new Map();
+            shards.forEach(shard => {
+                Object.keys(shard).forEach(term => {
+                    if (!term.startsWith(token)) return;
+                    const postings = shard[term];
+                    const factor = term === token ? 2 : 1;
+                    for (let i = 0; i < postings.length; i += 2) {
+                        const score = postings[i + 1] * factor;
+                        if (score > (scores.get(postings[i]) || 0)) scores.set(postings[i], score);
+                    }
+                });
+            });
+            return scores;
         });
     }
 
+    function search(query) {
+        const tokens = [...new Set(tokenize(query))].filter(t => t.length >= 2);
+        if (!tokens.length) return Promise.resolve(null);
+
+        return fetchJson(`${searchUrl}/index.json`).then(index =>
+            Promise.all(tokens.map(token => searchTerm(index, token))).then(perToken => {
+                // Alle zoekwoorden moeten voorkomen (EN); score = som over de woorden
+                let hits = [...perToken[0].entries()];
+                perToken.slice(1).forEach(scores => {
+                    hits = hits.filter(([doc]) => scores.has(doc)).map(([doc, score]) => [doc, score + scores.get(doc)]);
+                });
+                hits.sort((a, b) => b[1] - a[1] || a[0] - b[0]);
+                hits = hits.slice(0, MAX_RESULTS);
+
+                const chunks = [...new Set(hits.map(([doc]) => Math.floor(doc / index.chunk)))];
+                return Promise.all(chunks.map(n => fetchJson(`${searchUrl}/d-${n}.json?v=${index.docs[n]}`))).then(loaded => {
+                    const docs = new Map(chunks.map((n, i) => [n, loaded[i]]));
+                    return hits.map(([doc]) => {
+                        const [label, reference] = docs.get(Math.floor(doc / index.chunk))[doc % index.chunk];
+                        return {title: label, url: `/doc/${reference}`, type: 'concept'};
+                    });
+                });
+            })
+        );
+    }
+
+    let searchTimer = null;
+    function onFilterInput() {
+        clearTimeout(searchTimer);
+        searchTimer = setTimeout(() => {
+            const query = filterInput.value;
+            search(query).then(results => {
+                if (filterInput.value !== query) return; // Verouderd antwoord
+                lettersBar.style.display = results ? 'none' : 'block';
+                if (results) renderItems(results);
+                else if (navIndex) showLetter(currentLetter);
+            }).catch(showError);
+        }, 150);
+    }
+
     function setNavMode(mode) {
         if (mode === 'az') {
         originalList.style.display = 'none';
         azList.style.display = 'block';
         btn.textContent = 'hiërarchisch';
         localStorage.setItem('skos-nav-pref', 'az');
-        if (!dataLoaded) {
-            loadAndRenderData(); 
+        if (!navIndex) {
+            loadAndRenderData();
         } else {
             scrollToActive();
         }
         } else {
         originalList.style.display = 'block';
         azList.style.display = 'none';
-        btn.textContent = 'alfabetisch'; 
+        btn.textContent = 'alfabetisch';
         localStorage.setItem('skos-nav-pref', 'tree');
         }
     }
@@ -87,5 +209,13 @@ document.addEventListener("DOMContentLoaded", function() {
             setNavMode('tree');
         }
         });
+
+        lettersBar.addEventListener('click', function(e) {
+            const link = e.target.closest('a[data-letter]');
+            if (!link) return;
+            e.preventDefault();
+            showLetter(link.dataset.letter).catch(showError);
+        });
+        filterInput.addEventListener('input', onFilterInput);
     }
 });
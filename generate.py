@@ -1,20 +1,42 @@
 import sys
 import os
+import copy
+import re
+import time
 import glob
 import json
+import gzip
+import hashlib
+import pickle
+import multiprocessing
+import shutil
+import sqlite3
+import argparse
 import unicodedata
+import html
+import threading
+from importlib import metadata
 from enum import Enum
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Any, Callable, Union
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Any, Callable, Iterable, Tuple, Union
 
-import spacy
-from spacy.matcher import Matcher
 from slugify import slugify
 from jinja2 import Environment, FileSystemLoader
-from rdflib import Graph, Namespace, RDF, SKOS, DCTERMS, RDFS, URIRef, FOAF
+import rdflib
+from rdflib import Graph, Namespace, RDF, SKOS, DCTERMS, RDFS, URIRef, Literal, FOAF
 from rdflib.namespace import split_uri
-from pyshacl import validate
-from pattern.nl import pluralize, attributive
+from rdflib.plugins.serializers.turtle import TurtleSerializer
+# spaCy, pattern.nl en pyshacl worden pas geïmporteerd in de fase die ze nodig heeft (samen ruim een
+# seconde opstarttijd); zo starten `validate`, `index` en `export` zonder de NLP-bibliotheken.
+
+try:
+    import brotli # Optioneel: zonder brotli krijgen exports alleen een .gz-variant
+except ImportError:
+    brotli = None
 
 # ==============================================================================
 # 1. OMGEVING & CONFIGURATIE
@@ -26,6 +48,7 @@ class ProjectPaths:
     root: str
     templates: str = "templates"
     ttl_source: str = "begrippenkader"
+    cache: str = ".cache"
     
     @property
     def output_pages(self) -> str: return os.path.join(self.root, "_doc")
@@ -34,7 +57,13 @@ class ProjectPaths:
     def output_aliases(self) -> str: return os.path.join(self.root, "alias")
     
     @property
-    def output_nav(self) -> str: return os.path.join(self.root, "assets", "json", "alphabetical-nav.json")
+    def output_nav(self) -> str: return os.path.join(self.root, "assets", "json", "nav")
+    
+    @property
+    def output_nav_include(self) -> str: return os.path.join(self.root, "_includes", "begrippen-nav.html")
+    
+    @property
+    def output_search(self) -> str: return os.path.join(self.root, "assets", "json", "zoek")
     
     @property
     def output_homepage(self) -> str: return os.path.join(self.root, "index.md")
@@ -42,8 +71,32 @@ class ProjectPaths:
     @property
     def output_ttl(self) -> str: return os.path.join(self.root, "begrippenkader.ttl")
     
+    @property
+    def output_nt(self) -> str: return os.path.join(self.root, "begrippenkader.nt")
+    
+    @property
+    def output_jsonld(self) -> str: return os.path.join(self.root, "begrippenkader.jsonld")
+    
+    @property
+    def output_sqlite(self) -> str: return os.path.join(self.root, "begrippenkader.sqlite")
+    
     @property
     def output_json(self) -> str: return os.path.join(self.root, "begrippen.json")
+    
+    @property
+    def output_checksums(self) -> str: return os.path.join(self.root, "exports.sha256")
+    
+    @property
+    def output_manifest(self) -> str: return os.path.join(self.root, ".generate-manifest.json")
+    
+    @property
+    def pattern_cache(self) -> str: return os.path.join(self.cache, "autolink-patronen.json")
+    
+    @property
+    def shacl_cache(self) -> str: return os.path.join(self.cache, "shacl")
+    
+    @property
+    def source_cache(self) -> str: return os.path.join(self.cache, "ttl")
 
 # Namespaces
 NS = {
@@ -58,9 +111,88 @@ NS = {
 TTL_CONFIG = {
     "base": "https://begrippen.netbeheernederland.nl",
     "prefix": "https://begrippen.netbeheernederland.nl/id/",
-    "shacl_profile": "https://raw.githubusercontent.com/geonovum/NL-SBB/main/profiles/skos-ap-nl.ttl"
+    # Versie = git-ref in de NL-SBB repository. Een branch of tag wordt naar zijn commit-SHA herleid
+    # (hooguit eens per `shacl_ref_ttl` seconden), zodat cache en validatiestatus altijd aan een vaste
+    # versie hangen; een volledige SHA wordt direct gebruikt. Een lokaal pad als profiel ook.
+    "shacl_profile": "https://raw.githubusercontent.com/geonovum/NL-SBB/{versie}/profiles/skos-ap-nl.ttl",
+    "shacl_versie": "main",
+    "shacl_commits": "https://api.github.com/repos/geonovum/NL-SBB/commits/{versie}",
+    "shacl_ref_ttl": 24 * 3600,
+}
+
+NLP_CONFIG = {
+    "model": "nl_core_news_sm",
+    "batch_size": 256,             # Aantal teksten per nlp.pipe-batch
+    "n_process": 1,                # Aantal processen voor nlp.pipe (1 = in-process)
+    "engine": "matcher",           # Autolink-engine: 'matcher' (spaCy Matcher) of 'trie'
+    "link_labels": ("prefLabel",)  # Labelsoorten die autolinks opleveren: prefLabel, altLabel, hiddenLabel
 }
 
+EXPORT_CONFIG = {
+    "compress": ("gz", "br"),      # Voorgecomprimeerde varianten naast elke export ('br' alleen met brotli geïnstalleerd)
+    "gzip_level": 9,
+    "brotli_quality": 9,           # 11 is nauwelijks kleiner maar vele malen trager op grote kaders
+}
+
+# --jobs: een worker moet genoeg werk krijgen om zijn opstart (fork, pickling van model en resultaten)
+# terug te verdienen; op het meegeleverde kader (~240 begrippen, ~90 kB) is serieel het snelst.
+JOBS_CONFIG = {
+    "min_concepts": 250,           # Begrippen per worker bij het renderen
+    "min_bytes": 500_000,          # Te parsen Turtle per worker bij het inlezen
+}
+
+USAGE_CONFIG = {
+    # Lokale registers met het gebruik van begrippen in modellen, als {begrip-URI: [{model_name, model_url,
+    # element_name, element_url, element_type}, ...]}. Glob-patronen; meerdere registers worden samengevoegd.
+    "registers": ("registers/*.json",),
+    "required": ("model_name", "element_name"), # Velden die de tabel op de begrippagina nodig heeft
+}
+
+SEARCH_CONFIG = {
+    # Gewicht per veld in de zoekindex (hoger = hoger in de resultaten)
+    "weights": {"prefLabel": 8, "altLabel": 4, "hiddenLabel": 4, "definition": 1},
+    "shard_prefix": 2,             # Tokens worden per eerste N (gevouwen) tekens in een shard gezet
+    "doc_chunk": 500,              # Begrippen per shard van de documenttabel
+    # Alleen voor definities: te algemeen om op te zoeken
+    "stopwords": frozenset("de het een en van in op te voor met die dat of door aan als bij om uit tot is zijn wordt worden "
+                           "naar over niet dan ook er zich deze dit waarin waarmee waarbij".split()),
+}
+
+# Autolink-tellers (ContentLinker.stats): verwerkte teksten, gevonden matches, geplaatste links en
+# matches die vervielen door overlap met een langere/eerdere match of door zelfverwijzing
+LINK_STATS = ("teksten", "matches", "links", "overlap", "zelfverwijzing")
+
+# Subcommando's: de stappen van generate_site die ze uitvoeren. Alleen `validate` en `all` valideren.
+COMMANDS = {
+    "validate": (),
+    "index":    ("nav", "navboom", "zoekindex"),
+    "export":   ("exports",),
+    "pages":    ("homepage", "begrippen", "aliassen"),
+    "all":      ("homepage", "begrippen", "aliassen", "nav", "navboom", "zoekindex", "exports"),
+}
+
+# Uitvoer per stap (relatief aan de site-root), om bij een deelrun alleen eigen verouderde bestanden op te ruimen
+STEP_OUTPUTS = {
+    "homepage":  ("index.md",),
+    "begrippen": ("_doc/",),
+    "aliassen":  ("alias/",),
+    "nav":       ("assets/json/nav/",),
+    "navboom":   ("_includes/begrippen-nav.html",),
+    "zoekindex": ("assets/json/zoek/",),
+    "exports":   ("begrippenkader.", "begrippen.json", "exports.sha256"),
+}
+
+@dataclass
+class BuildOptions:
+    """Instellingen voor één generatierun (gevuld vanuit de command line)."""
+    incremental: bool = False
+    batch_size: int = NLP_CONFIG["batch_size"]
+    n_process: int = NLP_CONFIG["n_process"]
+    jobs: int = 1
+    engine: str = NLP_CONFIG["engine"]
+    link_labels: Tuple[str, ...] = NLP_CONFIG["link_labels"]
+    usage_registers: Tuple[str, ...] = USAGE_CONFIG["registers"]
+
 # ==============================================================================
 # 2. SCHEMA DEFINITIE
 # ==============================================================================
@@ -114,120 +246,498 @@ BEGRIPPEN_SCHEMA = {
     "heeft_bron":                        VeldDefinitie("Heeft bron", NS["dct"].source, VeldType.LINK_EXTERN),
 }
 
+# Hiërarchische relaties: (bovenliggend, onderliggend) per soort. 'broader' bepaalt de navigatieboom
+# en het kruimelpad; de andere soorten krijgen alleen afsluiting en pad.
+HIERARCHIEEN = {
+    "broader":   (NS["skos"].broader, NS["skos"].narrower),
+    "partitief": (NS["iso"].broaderPartitive, NS["iso"].narrowerPartitive),
+    "generiek":  (NS["iso"].broaderGeneric, NS["iso"].narrowerGeneric),
+}
+
+# Interne relaties (LINK_INTERN) en hun omgekeerde. Pagina's en SQLite tonen elke relatie vanuit
+# beide kanten, ook als ze maar aan één kant is vastgelegd (zie Hierarchy.links).
+INTERNE_INVERSEN = {
+    **{str(up): str(down) for up, down in HIERARCHIEEN.values()},
+    **{str(down): str(up) for up, down in HIERARCHIEEN.values()},
+    str(NS["skos"].related): str(NS["skos"].related),
+}
+
 # ==============================================================================
 # 3. CORE LOGICA
 # ==============================================================================
 
+class LabelTrie:
+    """Token-trie over alle oppervlaktevormen van de labels.
+    
+    Eén doorloop over de tokens levert per startpositie alle labels die daar beginnen,
+    langste eerst. Dat is dezelfde volgorde die de Matcher-engine na sorteren oplevert.
+    """
+    
+    __slots__ = ("root",)
+    END = None # Sleutel waaronder een knoop het label opslaat dat daar eindigt
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def add(self, forms: List[List[str]], term: str):
+        nodes = [self.root]
+        for options in forms:
+            nodes = [node.setdefault(form, {}) for node in nodes for form in options]
+        for node in nodes:
+            node.setdefault(self.END, term) # Eerst geregistreerde label wint
+
+    def matches(self, tokens: List[str]):
+        """Levert (term, start, end) per startpositie, langste match eerst."""
+        for start in range(len(tokens)):
+            node, found = self.root, []
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None: break
+                if self.END in node: found.append((node[self.END], start, end + 1))
+            yield from reversed(found)
+
+class PatternCache:
+    """Schijfcache van de oppervlaktevormen per label.
+    
+    De cache is als geheel geldig zolang spaCy-model en PatternLite niet van versie veranderen;
+    binnen die sleutel wordt per label bijgehouden, zodat een nieuw begrip alleen zijn eigen
+    label laat taggen in plaats van een volledige hercompilatie.
+    """
+    
+    def __init__(self, path: str, key: dict):
+        self.path = path
+        self.key = key
+        self.forms: Dict[str, List[List[str]]] = {}
+        self.dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("key") == key:
+                self.forms = data["forms"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def get(self, term: str) -> Optional[List[List[str]]]:
+        return self.forms.get(term)
+
+    def put(self, term: str, forms: List[List[str]]):
+        self.forms[term] = forms
+        self.dirty = True
+
+    def retain(self, terms: List[str]):
+        """Vergeet labels die niet meer voorkomen."""
+        stale = self.forms.keys() - set(terms)
+        for term in stale: del self.forms[term]
+        self.dirty |= bool(stale)
+
+    def save(self):
+        if not self.dirty: return
+        ensure_dir(self.path)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": self.key, "forms": self.forms}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+        self.dirty = False
+
 class ContentLinker:
     """Verrijkt tekst door begrippen automatisch om te zetten naar links."""
     
-    def __init__(self, lookup_index: Dict[str, dict]):
+    ENGINES = ("matcher", "trie")
+    
+    def __init__(self, lookup_index: Dict[str, dict], batch_size: int = NLP_CONFIG["batch_size"],
+                 n_process: int = NLP_CONFIG["n_process"], engine: str = NLP_CONFIG["engine"],
+                 link_labels: Tuple[str, ...] = NLP_CONFIG["link_labels"], cache_path: Optional[str] = None):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Onbekende autolink-engine: {engine}")
+        import spacy
         try:
-            self.nlp = spacy.load("nl_core_news_sm", disable=["ner", "parser", "lemmatizer"])
+            self.nlp = spacy.load(NLP_CONFIG["model"], disable=["ner", "parser", "lemmatizer"])
         except OSError:
             print("FOUT: SpaCy model ontbreekt.")
             sys.exit(1)
             
-        self.matcher = Matcher(self.nlp.vocab)
+        self.batch_size = batch_size
+        self.n_process = n_process
+        self.engine = engine
+        self.link_labels = link_labels
+        self.cache_path = cache_path
+        self.stats = dict.fromkeys(LINK_STATS, 0)
+        self.recompile(lookup_index)
+
+    def recompile(self, lookup_index: Dict[str, dict]):
+        """(Her)bouwt de patronen voor een nieuwe lookup; het geladen spaCy-model blijft staan."""
+        from spacy.matcher import Matcher
+        self.matcher = Matcher(self.nlp.vocab) if self.engine == "matcher" else None
+        self.trie = LabelTrie() if self.engine == "trie" else None
         self.url_map = {}
-        self._compile_patterns(lookup_index)
+        self.term_forms: Dict[str, List[List[str]]] = {}
+        self.alias_terms = set() # Alt-/zoektermen: linken nooit naar de eigen pagina
+        self.cache_hits = self.cache_misses = 0
+        self._compile_patterns(lookup_index, self.link_labels)
 
-    def _compile_patterns(self, lookup: Dict[str, dict]):
-        for _, data in lookup.items():
-            term = data['label']
-            if not term.strip(): continue
+    def derive(self, lookup_index: Dict[str, dict]) -> "ContentLinker":
+        """Nieuwe linker voor een andere lookup met hetzelfde (geladen) spaCy-model; deze blijft ongewijzigd.
+        
+        De tellers worden gedeeld, zodat ze over herlaadbeurten heen doorlopen.
+        """
+        linker = copy.copy(self)
+        linker.recompile(lookup_index)
+        return linker
+
+    def _pipe(self, texts: List[str]):
+        """Stroomt teksten in batches door de spaCy-pipeline (in volgorde)."""
+        return self.nlp.pipe(texts, batch_size=self.batch_size, n_process=self.n_process)
+
+    @staticmethod
+    def _label_terms(lookup: Dict[str, dict], link_labels: Tuple[str, ...]) -> List[Tuple[str, str, bool]]:
+        """(term, url, is_alias) per te linken label; voorkeurstermen gaan voor bij dubbele termen."""
+        keys = {"prefLabel": "label", "altLabel": "alt_labels", "hiddenLabel": "hidden_labels"}
+        terms = []
+        for kind in sorted(link_labels, key=lambda k: k != "prefLabel"):
+            for data in lookup.values():
+                labels = data[keys[kind]]
+                for term in ([labels] if isinstance(labels, str) else labels):
+                    if term.strip(): terms.append((term, f"/doc/{data['reference']}", kind != "prefLabel"))
+        return terms
 
-            doc = self.nlp(term)
-            pattern = []
+    @staticmethod
+    def _surface_forms(doc) -> List[List[str]]:
+        """Per token van een label de toegestane vormen (kleine letters): enkelvoud/meervoud of predicatief/attributief."""
+        from pattern.nl import pluralize, attributive # Alleen nodig voor labels die niet in de patrooncache staan
+        forms = []
+        for token in doc:
+            if not token.text.strip(): continue # Skip lege tokens
             
-            for token in doc:
-                if not token.text.strip(): continue # Skip lege tokens
-                
-                # Eenvoudige patroon generatie
-                p_opt = {"LOWER": token.text.lower()}
-                if token.pos_ == 'NOUN':
-                    try:
-                        forms = {token.text.lower(), pluralize(token.text).lower()}
-                        p_opt = {"LOWER": {"IN": list(forms)}}
-                    except: pass
-                elif token.pos_ == 'ADJ':
-                    try:
-                        forms = {token.text.lower(), attributive(token.text).lower()}
-                        p_opt = {"LOWER": {"IN": list(forms)}}
-                    except: pass
-                
-                pattern.append(p_opt)
+            options = [token.text.lower()]
+            try:
+                if token.pos_ == 'NOUN': options.append(pluralize(token.text).lower())
+                elif token.pos_ == 'ADJ': options.append(attributive(token.text).lower())
+            except: pass
+            forms.append(list(dict.fromkeys(options)))
+        return forms
 
-            if pattern:
+    def _cache_key(self) -> dict:
+        import spacy
+        try:
+            pattern_version = metadata.version("PatternLite")
+        except metadata.PackageNotFoundError:
+            pattern_version = "onbekend"
+        return {"model": self.nlp.meta.get("name"), "model_version": self.nlp.meta.get("version"),
+                "spacy": spacy.__version__, "pattern": pattern_version}
+
+    def _label_forms(self, terms: List[str]) -> Dict[str, List[List[str]]]:
+        """Oppervlaktevormen per label; uit de cache waar mogelijk, alleen nieuwe labels gaan door spaCy."""
+        cache = PatternCache(self.cache_path, self._cache_key()) if self.cache_path else None
+        unique = list(dict.fromkeys(terms))
+        
+        result = {term: cache.get(term) for term in unique} if cache else {}
+        missing = [term for term in unique if result.get(term) is None]
+        for term, doc in zip(missing, self._pipe(missing)):
+            result[term] = self._surface_forms(doc)
+            if cache: cache.put(term, result[term])
+        
+        if cache:
+            cache.retain(unique)
+            cache.save()
+        self.cache_hits, self.cache_misses = len(unique) - len(missing), len(missing)
+        return result
+
+    def _compile_patterns(self, lookup: Dict[str, dict], link_labels: Tuple[str, ...]):
+        terms = self._label_terms(lookup, link_labels)
+        forms_by_term = self._label_forms([term for term, _, _ in terms])
+        
+        for term, url, is_alias in terms:
+            if is_alias and term in self.url_map: continue # Voorkeurstermen gaan voor
+            forms = forms_by_term[term]
+            if not forms: continue
+            
+            if self.trie is not None:
+                self.trie.add(forms, term)
+            else:
+                pattern = [{"LOWER": f[0]} if len(f) == 1 else {"LOWER": {"IN": f}} for f in forms]
                 self.matcher.add(term, [pattern])
-                self.url_map[term] = f"/doc/{data['reference']}"
+            self.url_map[term] = url
+            self.term_forms[term] = forms
+            if is_alias: self.alias_terms.add(term)
 
     def process(self, text: str, current_page_title: str = "") -> str:
         if not text: return text
+        return self._link(self.nlp(text), text, current_page_title)
+
+    def process_batch(self, items: List[Tuple[str, str]], found: Optional[List[set]] = None,
+                      durations: Optional[List[float]] = None) -> List[str]:
+        """Linkt een reeks (tekst, paginatitel)-paren in één nlp.pipe-stroom; de volgorde blijft behouden.
         
-        doc = self.nlp(text)
-        matches = self.matcher(doc)
+        Met `found` (één set per item) worden de gelinkte URL's per tekst teruggegeven, met
+        `durations` de matchtijd per tekst (exclusief het gebatchte taggen).
+        """
+        todo = [i for i, (text, _) in enumerate(items) if text]
+        results = [text for text, _ in items]
         
-        # Sorteer: eerst vroegste start, daarna langste match
-        matches.sort(key=lambda x: (x[1], -(x[2] - x[1])))
+        docs = self._pipe([items[i][0] for i in todo])
+        for i, doc in zip(todo, docs):
+            text, title = items[i]
+            started = time.perf_counter()
+            results[i] = self._link(doc, text, title, found[i] if found is not None else None)
+            if durations is not None: durations[i] = time.perf_counter() - started
+        return results
+
+    def _candidates(self, doc):
+        """Alle matches als (term, start, end): eerst vroegste start, daarna langste match."""
+        if self.trie is not None:
+            return self.trie.matches([token.lower_ for token in doc])
         
-        parts = []
+        matches = self.matcher(doc)
+        matches.sort(key=lambda x: (x[1], -(x[2] - x[1])))
+        return ((self.nlp.vocab.strings[match_id], start, end) for match_id, start, end in matches)
+
+    def annotate(self, texts: List[str], current_page_title: str = "") -> List[List[Tuple[int, int, str]]]:
+        """Als process_batch, maar levert per tekst de links als (start, eind, url) op karakterposities."""
+        results = [[] for _ in texts]
+        todo = [i for i, text in enumerate(texts) if text]
+        for i, doc in zip(todo, self._pipe([texts[i] for i in todo])):
+            results[i] = [match for match in self._matches(doc, current_page_title) if match[2]]
+        return results
+
+    def _matches(self, doc, current_page_title: str):
+        """Niet-overlappende matches als (start, eind, url) op karakterposities, van links naar rechts."""
+        own_url = self.url_map.get(current_page_title.strip())
+        stats = self.stats
+        stats["teksten"] += 1
         last_idx = 0 # Karakterindex
         
-        for match_id, start, end in matches:
+        for term, start, end in self._candidates(doc):
             span = doc[start:end]
+            stats["matches"] += 1
             
-            if span.start_char < last_idx: continue # Overlap
+            if span.start_char < last_idx: # Overlap
+                stats["overlap"] += 1; continue
             
             # Checks: lege tekst of zelf-referentie
             if not span.text.strip(): continue
-            if span.text.strip().lower() == current_page_title.strip().lower(): continue
-            
-            term = self.nlp.vocab.strings[match_id]
             url = self.url_map.get(term)
+            if span.text.strip().lower() == current_page_title.strip().lower() or (term in self.alias_terms and url == own_url):
+                stats["zelfverwijzing"] += 1; continue
             
+            if url: stats["links"] += 1
+            yield span.start_char, span.end_char, url
+            last_idx = span.end_char
+
+    def _link(self, doc, text: str, current_page_title: str, found: Optional[set] = None) -> str:
+        parts = []
+        last_idx = 0
+        
+        for start, end, url in self._matches(doc, current_page_title):
             # Voeg tekst voor de match toe
-            parts.append(text[last_idx:span.start_char])
+            parts.append(text[last_idx:start])
             
             # Voeg link toe
             if url:
-                parts.append(f'<a href="{{{{ \'{url}\' | relative_url }}}}" class="auto-link">{span.text}</a>')
+                parts.append(f'<a href="{{{{ \'{url}\' | relative_url }}}}" class="auto-link">{text[start:end]}</a>')
+                if found is not None: found.add(url)
             else:
-                parts.append(span.text)
+                parts.append(text[start:end])
                 
-            last_idx = span.end_char
+            last_idx = end
             
         parts.append(text[last_idx:])
         return "".join(parts)
 
+# --- Conceptmodel ---
+# Eén doorloop over de triples levert per subject de waarden per predicaat; de generator leest
+# daarna alleen nog uit deze structuur in plaats van per veld de graaf te bevragen.
+
+class ConceptRecord:
+    """Alle waarden van één subject, per predicaat in bronvolgorde (als strings)."""
+    
+    __slots__ = ("uri", "values")
+
+    def __init__(self, uri: str):
+        self.uri = uri
+        self.values: Dict[str, List[str]] = {}
+
+    def add(self, pred: str, value: str) -> bool:
+        values = self.values.setdefault(pred, [])
+        if value in values: return False
+        values.append(value)
+        return True
+
+    def first(self, pred: str) -> Optional[str]:
+        values = self.values.get(str(pred))
+        return values[0] if values else None
+
+    def all(self, pred: str) -> List[str]:
+        return self.values.get(str(pred), [])
+
+class ConceptStore:
+    """In-memory model van het begrippenkader: records per subject plus voorberekende externe links."""
+    
+    __slots__ = ("records", "concepts", "scheme", "links", "usages", "hierarchy")
+
+    def __init__(self):
+        self.records: Dict[str, ConceptRecord] = {}
+        self.concepts: List[ConceptRecord] = [] # skos:Concepts met een IRI, in bronvolgorde
+        self.scheme: Optional[ConceptRecord] = None
+        self.links: Dict[str, dict] = {}        # subject -> {"url", "label"} voor externe verwijzingen
+        self.usages: Dict[str, List[dict]] = {} # genormaliseerde URI -> gebruik in modellen (zie load_usages)
+        self.hierarchy: Optional["Hierarchy"] = None # Gezet door build_index
+
+    @classmethod
+    def from_triples(cls, triples) -> "ConceptStore":
+        store = cls()
+        rdf_type = str(RDF.type)
+        concept_type, scheme_type = str(NS["skos"].Concept), str(NS["skos"].ConceptScheme)
+        
+        for s, p, o in triples:
+            record = store.records.get(str(s))
+            if record is None:
+                record = store.records[str(s)] = ConceptRecord(str(s))
+            if not record.add(str(p), str(o)) or str(p) != rdf_type: continue
+            
+            if str(o) == concept_type and isinstance(s, URIRef): store.concepts.append(record)
+            elif str(o) == scheme_type and store.scheme is None: store.scheme = record
+
+        for record in store.records.values():
+            label = record.first(NS["rdfs"].label) or record.first(NS["dct"].title)
+            page = record.first(NS["foaf"].page)
+            if label or page:
+                store.links[record.uri] = {"url": page or record.uri, "label": label or record.uri}
+        return store
+
+    def link(self, uri: str) -> dict:
+        """Externe link naar `uri`: titel en pagina uit de bronnen indien bekend, anders de URI zelf."""
+        return dict(self.links.get(uri) or {"url": uri, "label": uri})
+
+    def usage(self, uri: str) -> List[dict]:
+        return self.usages.get(normalize_uri(uri), [])
+
+class Hierarchy:
+    """Voorberekende hiërarchieën (broader, partitief, generiek) over de geïndexeerde begrippen.
+    
+    Per soort: de bovenliggende begrippen (expliciet plus omgekeerd uit narrower), cycli, en na het
+    breken van cycli de transitieve afsluiting en het primaire pad (steeds de eerste ouder).
+    `links` bevat per intern predicaat (INTERNE_INVERSEN) de relaties van elk begrip, aangevuld met de
+    omgekeerde kant en op label gesorteerd (polyhiërarchie, voor de pagina's en SQLite); `children`
+    alleen de onderliggende begrippen met dit begrip als primaire ouder, zodat de navigatieboom elk
+    begrip één keer toont.
+    Alles iteratief, dus ook diepe hiërarchieën halen de recursielimiet niet.
+    """
+    
+    __slots__ = ("cycles", "paths", "closure", "children", "links")
+
+    def __init__(self, store: ConceptStore, lookup: dict):
+        self.cycles: Dict[str, List[List[str]]] = {}
+        self.paths: Dict[str, Dict[str, List[str]]] = {}
+        self.closure: Dict[str, Dict[str, frozenset]] = {}
+        self.children: Dict[str, Dict[str, List[str]]] = {}
+        self.links = self._links(store, lookup)
+        for kind, (up, down) in HIERARCHIEEN.items():
+            parents = self._parents(store, lookup, str(up), str(down))
+            self.cycles[kind] = self._break_cycles(parents)
+            self._derive(kind, parents)
+            for siblings in self.children[kind].values():
+                siblings.sort(key=lambda n: get_normalized_sort_key(lookup[n]["label"]))
+
+    @staticmethod
+    def _links(store: ConceptStore, lookup: dict) -> Dict[str, Dict[str, List[str]]]:
+        """Interne relaties zoals vastgelegd (dus vóór het breken van cycli), aangevuld met de omgekeerde kant."""
+        links: Dict[str, Dict[str, set]] = {pred: {} for pred in INTERNE_INVERSEN} # Alleen begrippen mét relaties
+        for uri in lookup:
+            for pred, inverse in INTERNE_INVERSEN.items():
+                for target in store.records[uri].all(pred):
+                    if target in lookup and target != uri:
+                        links[pred].setdefault(uri, set()).add(target)
+                        links[inverse].setdefault(target, set()).add(uri)
+        key = lambda n: get_normalized_sort_key(lookup[n]["label"])
+        return {pred: {uri: sorted(targets, key=key) for uri, targets in adjacency.items()} for pred, adjacency in links.items()}
+
+    @staticmethod
+    def _parents(store: ConceptStore, lookup: dict, up: str, down: str) -> Dict[str, List[str]]:
+        parents = {uri: [] for uri in lookup}
+        for uri in lookup:
+            for parent in store.records[uri].all(up):
+                if parent in lookup and parent != uri and parent not in parents[uri]: parents[uri].append(parent)
+        for uri in lookup:
+            for child in store.records[uri].all(down):
+                if child in lookup and child != uri and uri not in parents[child]: parents[child].append(uri)
+        return parents
+
+    @staticmethod
+    def _break_cycles(parents: Dict[str, List[str]]) -> List[List[str]]:
+        """Diepte-eerst over de ouderrelatie; elke terugwaartse kant is een cyclus en wordt verwijderd."""
+        state: Dict[str, int] = {}  # 1 = op de stapel, 2 = klaar
+        cycles = []
+        for start in parents:
+            if start in state: continue
+            state[start] = 1
+            stack = [(start, iter(list(parents[start])))]
+            while stack:
+                node, it = stack[-1]
+                parent = next(it, None)
+                if parent is None:
+                    state[node] = 2
+                    stack.pop()
+                elif state.get(parent) == 1:
+                    trail = [n for n, _ in stack]
+                    cycles.append(trail[trail.index(parent):] + [parent])
+                    parents[node].remove(parent)
+                elif parent not in state:
+                    state[parent] = 1
+                    stack.append((parent, iter(list(parents[parent]))))
+        return cycles
+
+    def _derive(self, kind: str, parents: Dict[str, List[str]]):
+        paths, closure = {}, {}
+        children: Dict[str, List[str]] = {} # Alleen begrippen mét kinderen
+        none = frozenset()
+        for start in parents:
+            # Ouders eerst afhandelen (post-order), zodat pad en afsluiting van de ouders al bekend zijn
+            stack = [start]
+            while stack:
+                node = stack[-1]
+                if node in paths: stack.pop(); continue
+                todo = [p for p in parents[node] if p not in paths]
+                if todo: stack.extend(todo); continue
+                stack.pop()
+                first = parents[node][0] if parents[node] else None
+                paths[node] = paths[first] + [first] if first else []
+                closure[node] = frozenset(parents[node]).union(*(closure[p] for p in parents[node])) if first else none
+                if first: children.setdefault(first, []).append(node)
+        self.paths[kind], self.closure[kind], self.children[kind] = paths, closure, children
+
+    def path(self, uri: str, kind: str = "broader") -> List[str]:
+        """Kruimelpad van wortel tot en met de (primaire) ouder."""
+        return self.paths[kind].get(uri, [])
+
+    def ancestors(self, uri: str, kind: str = "broader") -> frozenset:
+        return self.closure[kind].get(uri, frozenset())
+
+    def roots(self, kind: str = "broader", lookup: Optional[dict] = None) -> List[str]:
+        roots = [uri for uri, path in self.paths[kind].items() if not path]
+        if lookup: roots.sort(key=lambda n: get_normalized_sort_key(lookup[n]["label"]))
+        return roots
+
 # --- Extractie Strategieën ---
 # Deze functies corresponderen 1-op-1 met de VeldTypes.
 
-def extract_single_text(graph: Graph, subject: URIRef, pred: URIRef, **kwargs) -> Optional[str]:
-    val = graph.value(subject, pred)
-    return str(val) if val else None
+def extract_single_text(record: ConceptRecord, pred: URIRef, **kwargs) -> Optional[str]:
+    return record.first(pred) or None
 
-def extract_text_list(graph: Graph, subject: URIRef, pred: URIRef, **kwargs) -> List[str]:
-    return [str(o) for o in graph.objects(subject, pred)]
+def extract_text_list(record: ConceptRecord, pred: URIRef, **kwargs) -> List[str]:
+    return list(record.all(pred))
 
-def extract_internal_links(graph: Graph, subject: URIRef, pred: URIRef, lookup: dict, **kwargs) -> List[dict]:
+def extract_internal_links(record: ConceptRecord, pred: URIRef, lookup: dict, store: ConceptStore, **kwargs) -> List[dict]:
+    # Van beide kanten aangevuld (bv. ook onderliggend als het andere begrip alleen skos:broader heeft)
     links = []
-    for obj in graph.objects(subject, pred):
-        uri = str(obj)
-        if uri in lookup:
-            links.append({
-                "url": f"/doc/{lookup[uri]['reference']}",
-                "label": lookup[uri]['label']
-            })
+    for uri in store.hierarchy.links[str(pred)].get(record.uri, []):
+        links.append({
+            "url": f"/doc/{lookup[uri]['reference']}",
+            "label": lookup[uri]['label']
+        })
     return links
 
-def extract_external_links(graph: Graph, subject: URIRef, pred: URIRef, **kwargs) -> List[dict]:
-    links = []
-    for obj in graph.objects(subject, pred):
-        label = graph.value(obj, NS["rdfs"].label) or graph.value(obj, NS["dct"].title) or str(obj)
-        url = str(graph.value(obj, NS["foaf"].page)) if graph.value(obj, NS["foaf"].page) else str(obj)
-        links.append({"url": url, "label": str(label)})
-    return links
+def extract_external_links(record: ConceptRecord, pred: URIRef, store: ConceptStore, **kwargs) -> List[dict]:
+    return [store.link(uri) for uri in record.all(pred)]
 
 # Mapping van VeldType naar de uitvoerende functie
 EXTRACTORS = {
@@ -241,21 +751,213 @@ EXTRACTORS = {
 # 4. DATA PROCESSING
 # ==============================================================================
 
-def build_index(graph: Graph) -> Dict[str, dict]:
+def source_files(paths: ProjectPaths) -> List[str]:
+    return sorted(glob.glob(os.path.join(paths.ttl_source, "*.ttl")))
+
+class _RecordingGraph(Graph):
+    """Graaf die de volgorde vastlegt waarin de parser triples toevoegt.
+    
+    Een rdflib-graaf itereert in willekeurige (hash-)volgorde; door in parse-volgorde opnieuw in te
+    voegen houden objectlijsten (bv. altLabels) dezelfde volgorde als bij een directe graph.parse.
+    """
+    
+    def __init__(self):
+        super().__init__()
+        self.ordered = []
+
+    def add(self, triple):
+        if triple not in self: self.ordered.append(triple)
+        return super().add(triple)
+
+def parse_turtle(path: str) -> Tuple[list, list]:
+    """Parseert één TTL-bestand naar (triples, eigen prefixen). Top-level, zodat het in een procespool kan draaien."""
+    graph = _RecordingGraph().parse(path, format="turtle")
+    defaults = set(Graph().namespaces())
+    return graph.ordered, [(prefix, str(ns)) for prefix, ns in graph.namespaces() if (prefix, ns) not in defaults]
+
+def read_sources(paths: ProjectPaths, files: List[str], jobs: int = 1) -> List[Tuple[list, list]]:
+    """Geparste inhoud per bronbestand (in volgorde).
+    
+    Per bestand staat een binaire (pickle) kopie van de triples in de cache, met de hash van het
+    bestand en de rdflib-versie als sleutel; alleen gewijzigde bestanden gaan door de Turtle-parser,
+    en bij `jobs > 1` (en genoeg werk, zie JOBS_CONFIG) verdeeld over een procespool.
+    """
+    cached = [source_cache_path(paths, f) for f in files]
+    results: List[Optional[Tuple[list, list]]] = []
+    for path in cached:
+        try:
+            with open(path, "rb") as fh:
+                results.append(pickle.load(fh))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            results.append(None)
+
+    missing = [i for i, parsed in enumerate(results) if parsed is None]
+    workers = effective_jobs(jobs, sum(os.path.getsize(files[i]) for i in missing), JOBS_CONFIG["min_bytes"])
+    if workers > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(missing))) as pool:
+            parsed = list(pool.map(parse_turtle, [files[i] for i in missing]))
+    else:
+        parsed = [parse_turtle(files[i]) for i in missing]
+
+    for i, content in zip(missing, parsed):
+        results[i] = content
+        ensure_dir(cached[i])
+        with open(f"{cached[i]}.tmp", "wb") as fh:
+            pickle.dump(content, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f"{cached[i]}.tmp", cached[i])
+    return results
+
+def source_cache_path(paths: ProjectPaths, path: str) -> str:
+    return os.path.join(paths.source_cache, f"{file_hash(path)}-rdflib{rdflib.__version__}.pickle")
+
+def prune_source_cache(paths: ProjectPaths, files: List[str]):
+    """Ruimt parse-caches op van bronversies die niet meer bestaan (na een volledige inleesronde)."""
+    prune_cache(paths.source_cache, {os.path.basename(source_cache_path(paths, f)) for f in files})
+
+def add_source(graph: Graph, content: Tuple[list, list]) -> Graph:
+    triples, namespaces = content
+    for prefix, ns in namespaces: graph.bind(prefix, ns) # Zoals graph.parse het ook doet
+    graph.addN((s, p, o, graph) for s, p, o in triples)
+    return graph
+
+def source_graph(paths: ProjectPaths, path: str) -> Graph:
+    """Eén bronbestand als losse graaf (via de cache)."""
+    return add_source(Graph(), read_sources(paths, [path])[0])
+
+def load_vocabulary(paths: ProjectPaths, jobs: int = 1) -> Optional[Tuple[Graph, ConceptStore]]:
+    """Laadt alle TTL-bestanden (in vaste volgorde) als graaf én conceptmodel; None als er geen bronnen zijn."""
+    files = source_files(paths)
+    if not files: return None
+    
+    contents = read_sources(paths, files, jobs)
+    prune_source_cache(paths, files)
+    graph = Graph()
+    for content in contents: add_source(graph, content)
+    store = ConceptStore.from_triples(t for triples, _ in contents for t in triples)
+    return graph, store
+
+# --- Streamingmodus ---
+# Voor kaders die als één rdflib-graaf niet in het geheugen van een kleine CI-runner passen: een eerste
+# doorgang bouwt alleen een skelet (index, links, hiërarchie), daarna wordt per bronbestand verwerkt.
+
+# Predicaten van begrippen die in het skelet komen: alles wat build_index, de hiërarchie, de
+# zoekindex en externe links over bestandsgrenzen heen nodig hebben. Andere subjects gaan er volledig in.
+SKELETON_PREDICATES = frozenset(str(p) for p in (
+    RDF.type, NS["skos"].prefLabel, NS["skos"].altLabel, NS["skos"].hiddenLabel, NS["skos"].definition,
+    NS["rdfs"].label, NS["dct"].title, NS["foaf"].page,
+    *INTERNE_INVERSEN,
+))
+
+class StreamSource:
+    """Bronbestanden in de streamingmodus: per bestand een graaf of conceptmodel, één tegelijk in het geheugen.
+    
+    Een begrip hoort thuis in het eerste bestand waarin het als skos:Concept getypeerd wordt; alleen
+    begrippen met triples in meerdere bestanden worden volledig vastgehouden (`merged`).
+    """
+    
+    def __init__(self, paths: ProjectPaths, files: List[str], skeleton: ConceptStore,
+                 home: Dict[str, int], merged: Dict[str, ConceptRecord]):
+        self.paths = paths
+        self.files = files
+        self.skeleton = skeleton
+        self.home = home
+        self.merged = merged
+
+    def stores(self):
+        """Per bestand een ConceptStore met de begrippen die daar thuishoren (in bronvolgorde).
+        
+        Links, gebruik en hiërarchie komen uit het skelet, zodat process_concept en build_sqlite
+        dezelfde uitvoer geven als met het volledige model.
+        """
+        homes = set(self.home.values())
+        for i, f in enumerate(self.files):
+            if i not in homes: continue
+            store = ConceptStore.from_triples(read_sources(self.paths, [f])[0][0])
+            store.concepts = [self.merged.get(c.uri, c) for c in store.concepts if self.home.get(c.uri) == i]
+            store.scheme, store.links = self.skeleton.scheme, self.skeleton.links
+            store.usages, store.hierarchy = self.skeleton.usages, self.skeleton.hierarchy
+            yield store
+
+    def graphs(self):
+        for f in self.files:
+            yield source_graph(self.paths, f)
+
+def load_skeleton(paths: ProjectPaths) -> Optional[Tuple[ConceptStore, StreamSource, int]]:
+    """Eerste doorgang van de streamingmodus: skelet-model, bronnen en het aantal gelezen triples.
+    
+    Bestanden worden één voor één gelezen (via de parse-cache); er staat nooit een volledige graaf in het geheugen.
+    """
+    files = source_files(paths)
+    if not files: return None
+    rdf_type, concept_type = str(RDF.type), str(NS["skos"].Concept)
+    first_file: Dict[str, int] = {}
+    spread: Dict[str, List[int]] = {} # subject -> bestanden, alleen bij meer dan één
+    home: Dict[str, int] = {}
+    count = 0
+
+    def skeleton_triples():
+        nonlocal count
+        for i, f in enumerate(files):
+            triples = read_sources(paths, [f])[0][0]
+            count += len(triples)
+            concepts = {str(s) for s, p, o in triples if str(p) == rdf_type and str(o) == concept_type}
+            for s, p, o in triples:
+                key = str(s)
+                if first_file.setdefault(key, i) != i and spread.setdefault(key, [first_file[key]])[-1] != i:
+                    spread[key].append(i)
+                if key in concepts and str(p) == rdf_type and str(o) == concept_type and isinstance(s, URIRef):
+                    home.setdefault(key, i)
+                if key not in concepts or str(p) in SKELETON_PREDICATES: yield s, p, o
+    skeleton = ConceptStore.from_triples(skeleton_triples())
+    prune_source_cache(paths, files)
+
+    # Begrippen verspreid over meerdere bestanden: volledige records, in dezelfde volgorde als bij één graaf
+    merged_uris = spread.keys() & home.keys()
+    needed = sorted({i for uri in merged_uris for i in spread[uri]})
+    merged = ConceptStore.from_triples(t for i in needed for t in read_sources(paths, [files[i]])[0][0]
+                                       if str(t[0]) in merged_uris).records
+    return skeleton, StreamSource(paths, files, skeleton, home, merged), count
+
+def normalize_uri(uri: str) -> str:
+    """Registers en bronnen zijn niet consequent in een afsluitende slash; vergelijk zonder."""
+    return uri.strip().rstrip("/")
+
+def load_usages(patterns: Tuple[str, ...]) -> Dict[str, List[dict]]:
+    """Gebruik van begrippen in modellen uit lokale registerbestanden, per genormaliseerde begrip-URI.
+    
+    Registers worden in (gesorteerde) bestandsvolgorde samengevoegd; dubbele regels vallen weg.
+    Een placeholder (onleesbaar, geen object, leeg of zonder URI-sleutels) of een register met
+    onbruikbare regels levert een ValueError op: liever geen build dan pagina's zonder gebruikstabel.
+    """
+    files = sorted(f for pattern in patterns for f in glob.glob(pattern))
+    usages: Dict[str, List[dict]] = {}
+    for path in files:
+        register = read_json(path)
+        if not isinstance(register, dict) or not register or not any(uri.startswith(("http://", "https://")) for uri in register):
+            raise ValueError(f"gebruiksregister {path} is onleesbaar, leeg of een placeholder (geen begrip-URI's)")
+        malformed = [uri for uri, rows in register.items()
+                     if not uri.startswith(("http://", "https://")) or not isinstance(rows, list)
+                     or not all(isinstance(row, dict) and all(isinstance(row.get(key), str) for key in USAGE_CONFIG["required"]) for row in rows)]
+        if malformed:
+            raise ValueError(f"{len(malformed)} ongeldige regel(s) in gebruiksregister {path} (verwacht: begrip-URI -> lijst van "
+                             f"objecten met {', '.join(USAGE_CONFIG['required'])}), bv. {malformed[0]}")
+        for uri, rows in register.items():
+            target = usages.setdefault(normalize_uri(uri), [])
+            target.extend(row for row in rows if row not in target)
+    return usages
+
+def build_index(store: ConceptStore) -> Dict[str, dict]:
     """Maakt een lookup tabel van URI naar basisgegevens."""
     index = {}
-    for concept in graph.subjects(RDF.type, NS["skos"].Concept):
-        if not isinstance(concept, URIRef): continue
-        
-        uri = str(concept)
+    for concept in store.concepts:
+        uri = concept.uri
         # Robuuste reference extractie (ook bij trailing slashes)
         try:
             ref = split_uri(uri)[1] or uri.strip('/').split('/')[-1]
         except:
             ref = uri.strip('/').split('/')[-1]
 
-        label_val = graph.value(concept, NS["skos"].prefLabel)
-        label = str(label_val) if label_val else ref
+        label = concept.first(NS["skos"].prefLabel) or ref
         
         # FILTER: Sla begrippen zonder tekst over (voorkomt lege matches)
         if not ref or not label or not label.strip():
@@ -264,14 +966,23 @@ def build_index(graph: Graph) -> Dict[str, dict]:
         index[uri] = {
             "reference": ref,
             "label": label.strip(),
-            "slug": slugify(label)
+            "slug": slugify(label),
+            "alt_labels": list(concept.all(NS["skos"].altLabel)),
+            "hidden_labels": list(concept.all(NS["skos"].hiddenLabel))
         }
+    
+    # Hiërarchieën hangen af van welke begrippen geïndexeerd zijn; daarom hier, één keer per index
+    store.hierarchy = Hierarchy(store, index)
+    for kind, cycles in store.hierarchy.cycles.items():
+        for cycle in cycles:
+            print(f"LET OP: cyclus in {kind}-hiërarchie: {' → '.join(index[uri]['label'] for uri in cycle)}")
     return index
 
-def process_concept(graph: Graph, concept: URIRef, lookup: dict, linker: ContentLinker) -> dict:
-    """Verzamelt alle data en past autolinking toe."""
-    uri = str(concept)
+def process_concept(store: ConceptStore, concept: ConceptRecord, lookup: dict, linker: Optional[ContentLinker] = None) -> dict:
+    """Verzamelt alle data en past autolinking toe (zonder linker blijven tekstvelden ongelinkt)."""
+    uri = concept.uri
     meta = lookup[uri]
+    status = concept.first(NS["adms"].status)
     
     data = {
         "uri": uri,
@@ -279,18 +990,18 @@ def process_concept(graph: Graph, concept: URIRef, lookup: dict, linker: Content
         "voorkeursterm": meta["label"],
         "slug": meta["slug"],
         "permalink": f"/doc/{meta['reference']}",
-        "status": str(graph.value(concept, NS["adms"].status)).split("/")[-1] if graph.value(concept, NS["adms"].status) else None,
+        "status": status.split("/")[-1] if status else None,
         "mapping": BEGRIPPEN_SCHEMA, # Voor de template
-        "parent_label": None
+        "gebruik": store.usage(uri)
     }
 
     # Dynamische extractie via de strategy map
     for field_key, config in BEGRIPPEN_SCHEMA.items():
         extractor_func = EXTRACTORS[config.type]
-        value = extractor_func(graph, concept, config.predicaat, lookup=lookup)
+        value = extractor_func(concept, config.predicaat, lookup=lookup, store=store)
         
         # Autolink tekstvelden indien nodig
-        if config.auto_link and value:
+        if linker and config.auto_link and value:
             if isinstance(value, list):
                 value = [linker.process(item, meta["label"]) for item in value]
             elif isinstance(value, str):
@@ -298,119 +1009,1522 @@ def process_concept(graph: Graph, concept: URIRef, lookup: dict, linker: Content
                 
         data[field_key] = value
 
-    # Breadcrumb helper
-    if data.get("heeft_bovenliggend_begrip"):
-        data["parent_label"] = data["heeft_bovenliggend_begrip"][0]["label"]
-
+    data["hierarchie"] = hierarchy_data(store.hierarchy, uri, lookup)
     return data
 
+def hierarchy_data(hierarchy: Hierarchy, uri: str, lookup: dict) -> dict:
+    """Kruimelpaden per hiërarchie voor de template."""
+    def link(target: str) -> dict:
+        return {"label": lookup[target]["label"], "url": f"/doc/{lookup[target]['reference']}"}
+    
+    paths = {}
+    for kind in HIERARCHIEEN:
+        path = hierarchy.path(uri, kind)
+        if path: paths[kind] = {"pad": [link(n) for n in path]}
+    return paths
+
+def process_concepts(store: ConceptStore, concepts: List[ConceptRecord], lookup: dict, linker: ContentLinker,
+                     links: Optional[Dict[str, set]] = None, timings: Optional[Dict[str, float]] = None) -> List[dict]:
+    """Batch-variant van process_concept: alle autolink-teksten gaan in één stroom door de linker.
+    
+    Met `links` worden per begrip-URI de URL's verzameld waar de autolinker naar verwees, met
+    `timings` de verwerkingstijd per begrip (extractie plus matchen).
+    """
+    datas = []
+    for concept in concepts:
+        if concept.uri not in lookup: continue
+        started = time.perf_counter()
+        datas.append(process_concept(store, concept, lookup))
+        if timings is not None: timings[concept.uri] = timings.get(concept.uri, 0.0) + time.perf_counter() - started
+    
+    # Verzamel (data, veld, positie) per te linken tekst
+    slots, items = [], []
+    for data in datas:
+        for field_key, config in BEGRIPPEN_SCHEMA.items():
+            value = data[field_key]
+            if not (config.auto_link and value): continue
+            if isinstance(value, list):
+                for i, item in enumerate(value):
+                    slots.append((data, field_key, i))
+                    items.append((item, data["voorkeursterm"]))
+            elif isinstance(value, str):
+                slots.append((data, field_key, None))
+                items.append((value, data["voorkeursterm"]))
+
+    found = [set() for _ in items] if links is not None else None
+    durations = [0.0] * len(items) if timings is not None else None
+    for n, ((data, field_key, i), text) in enumerate(zip(slots, linker.process_batch(items, found, durations))):
+        if links is not None: links.setdefault(data["uri"], set()).update(found[n])
+        if timings is not None: timings[data["uri"]] += durations[n]
+        if i is None:
+            data[field_key] = text
+        else:
+            data[field_key][i] = text
+    return datas
+
 def get_normalized_sort_key(text: str) -> str:
     """Zorgt voor correcte A-Z sortering (negeert accenten)."""
     return ''.join(c for c in unicodedata.normalize('NFD', text.lower()) if unicodedata.category(c) != 'Mn')
 
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+def search_tokens(text: str) -> List[str]:
+    """Zoektokens: kleine letters, accenten gevouwen (zoals get_normalized_sort_key), gesplitst op niet-alfanumeriek."""
+    return TOKEN_RE.findall(get_normalized_sort_key(text))
+
+def shard_key(folded: str, length: int) -> str:
+    """Shardnaam voor een gevouwen term: de eerste `length` tekens, of '_' voor alles buiten a-z/0-9."""
+    key = folded[:length]
+    return key if re.fullmatch(r"[a-z0-9]+", key) else "_"
+
 def ensure_dir(path: str):
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
+def effective_jobs(jobs: int, work: int, per_worker: int) -> int:
+    """Aantal processen dat loont: hooguit `jobs` en het aantal CPU's, met minstens `per_worker` werk elk."""
+    return max(1, min(jobs, os.cpu_count() or 1, work // per_worker))
+
+def prune_cache(folder: str, keep: Iterable[str], pattern: str = "*"):
+    """Verwijdert cachebestanden in `folder` (die op `pattern` passen) die niet in `keep` staan.
+
+    Caches op inhoudshash groeien anders met elke bewerking mee, ook in de CI-cache.
+    """
+    keep = set(keep)
+    for path in glob.glob(os.path.join(folder, pattern)):
+        if os.path.basename(path) not in keep and os.path.isfile(path): os.remove(path)
+
+def file_hash(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def read_json(path: str, default: Any = None) -> Any:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def content_hash(*parts: Any) -> str:
+    """Stabiele hash over (geneste) invoerdata, onafhankelijk van de volgorde van dict-sleutels."""
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class BuildManifest:
+    """Houdt per uitvoerbestand de hash bij van de invoer waarmee het gegenereerd is.
+    
+    In incrementele modus wordt een bestand alleen (opnieuw) geschreven als de hash afwijkt
+    van de vorige run. Zo blijven mtimes van ongewijzigde pagina's staan en hoeft
+    `jekyll --incremental` alleen de echt gewijzigde pagina's te herbouwen.
+    
+    Elke hash wordt gecombineerd met die van generate.py zelf: een nieuwe generatorversie (andere
+    serialisatie, SQLite-schema of paginadata) schrijft alle uitvoer opnieuw in plaats van oude
+    exports en pagina's te laten staan.
+    """
+    
+    def __init__(self, path: str, root: str, incremental: bool = False, carry_over: bool = False):
+        self.path = path
+        self.root = root
+        self.incremental = incremental
+        self.version = file_hash(os.path.abspath(__file__))
+        self.previous = self._load()
+        # carry_over: deelrun (watch-modus), niet-aangeraakte uitvoer blijft in het manifest staan
+        self.current: Dict[str, str] = dict(self.previous) if carry_over else {}
+        self.touched = set()
+        self.written = 0
+        self.skipped = 0
+        self.removed = 0
+
+    def _load(self) -> Dict[str, str]:
+        return read_json(self.path, {})
+
+    def _key(self, path: str) -> str:
+        return os.path.relpath(path, self.root).replace(os.sep, "/")
+
+    def keep(self, path: str, digest: str) -> bool:
+        """Registreert `path` met zijn invoer-hash; True als het bestaande bestand mag blijven staan."""
+        key = self._key(path)
+        digest = content_hash(self.version, digest)
+        self.current[key] = digest
+        self.touched.add(key)
+        return self.incremental and self.previous.get(key) == digest and os.path.exists(path)
+
+    def write(self, path: str, digest: str, render: Callable[[], str]) -> bool:
+        """Schrijft `render()` naar `path`, tenzij de invoer-hash ongewijzigd is."""
+        if self.keep(path, digest):
+            self.skipped += 1
+            return False
+        
+        ensure_dir(path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(render())
+        self.written += 1
+        return True
+
+    def remove(self, path: str):
+        key = self._key(path)
+        self.current.pop(key, None)
+        try:
+            os.remove(path)
+            self.removed += 1
+        except FileNotFoundError:
+            pass
+
+    def remove_stale(self, prefix: Union[str, Tuple[str, ...]] = ""):
+        """Verwijdert uitvoer (onder `prefix`) van een vorige run die nu niet meer gegenereerd wordt."""
+        for key in (self.previous.keys() | self.current.keys()) - self.touched:
+            if key.startswith(prefix): self.remove(os.path.join(self.root, key))
+
+    def save(self):
+        ensure_dir(self.path)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.current, f, indent=0, sort_keys=True)
+
+def cpu_time() -> float:
+    """CPU-tijd (user + system) van dit proces plus afgeronde subprocessen (procespools)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+def peak_rss_mb() -> Dict[str, Optional[float]]:
+    """Piekgeheugen (RSS) in MB van dit proces en van de grootste subprocessen; None waar niet meetbaar (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return {"proces": None, "subprocessen": None}
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024 # ru_maxrss: bytes op macOS, KB op Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit
+    try: # Linux: ru_maxrss neemt bij fork/exec de RSS van de ouder mee, VmHWM telt alleen dit proces
+        with open("/proc/self/status", encoding="ascii") as f:
+            own = next(int(line.split()[1]) / 1024 for line in f if line.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        pass
+    return {"proces": round(own, 1),
+            "subprocessen": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit, 1)}
+
+class BuildProfile:
+    """Meetgegevens van één generatorrun: wand- en CPU-tijd per fase, aantallen en autolink-tellers.
+    
+    De fasetijden worden altijd bijgehouden (goedkoop); de tijd per begrip alleen als `enabled`
+    (--profile), omdat die per tekst gemeten wordt.
+    """
+    
+    def __init__(self, enabled: bool = False, top: int = 10):
+        self.enabled = enabled
+        self.top = top
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.autolink: Dict[str, int] = {}
+        self.concept_times: Optional[Dict[str, float]] = {} if enabled else None
+
+    @contextmanager
+    def phase(self, name: str):
+        wall, cpu = time.perf_counter(), cpu_time()
+        try:
+            yield
+        finally:
+            self.phases[name] = {"wand_s": round(time.perf_counter() - wall, 4), "cpu_s": round(cpu_time() - cpu, 4)}
+
+    def report(self, lookup: Optional[dict] = None) -> dict:
+        slowest = sorted((self.concept_times or {}).items(), key=lambda x: x[1], reverse=True)[:self.top]
+        return {
+            "fasen": self.phases,
+            "totaal": {key: round(sum(p[key] for p in self.phases.values()), 4) for key in ("wand_s", "cpu_s")},
+            "piek_rss_mb": peak_rss_mb(),
+            "aantallen": self.counts,
+            "autolink": self.autolink,
+            "traagste_begrippen": [{"uri": uri, "label": (lookup or {}).get(uri, {}).get("label"), "s": round(t, 4)}
+                                   for uri, t in slowest],
+        }
+
+    def save(self, path: str, lookup: Optional[dict] = None):
+        report = self.report(lookup)
+        ensure_dir(os.path.abspath(path))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        
+        print(f"Profiel ({path}):")
+        for name, p in self.phases.items():
+            print(f"   {name:<12}{p['wand_s']:9.3f} s wand {p['cpu_s']:9.3f} s cpu")
+        rss = report["piek_rss_mb"]
+        if rss["proces"] is not None: print(f"   Piek-RSS: {rss['proces']} MB (subprocessen: {rss['subprocessen']} MB)")
+        for item in report["traagste_begrippen"][:5]:
+            print(f"   traag: {item['label']} ({item['s'] * 1000:.1f} ms)")
+
 # ==============================================================================
-# 5. GENERATOREN
+# 5. VALIDATIE
 # ==============================================================================
 
-def generate_site(graph: Graph, paths: ProjectPaths):
-    env = Environment(loader=FileSystemLoader(paths.templates))
-    lookup = build_index(graph)
-    linker = ContentLinker(lookup)
-    
-    # Homepage
-    print(f" - Homepage: {paths.output_homepage}")
-    scheme = graph.value(None, RDF.type, NS["skos"].ConceptScheme)
-    title = str(graph.value(scheme, NS["dct"].title) or "Begrippenkader")
-    desc = str(graph.value(scheme, NS["rdfs"].comment) or "")
-    
-    ensure_dir(paths.output_homepage)
-    with open(paths.output_homepage, "w", encoding="utf-8") as f:
-        f.write(env.get_template("index.md.jinja2").render(naam=title, uitleg=desc))
-
-    # Begrippenpagina's
-    print(f" - Begrippen: {paths.output_pages}")
-    template = env.get_template("begrip.md.jinja2")
-    ensure_dir(paths.output_pages + "/") # Zorg dat map bestaat
-    
-    for concept in graph.subjects(RDF.type, NS["skos"].Concept):
-        if not isinstance(concept, URIRef): continue
-        data = process_concept(graph, concept, lookup, linker)
-        
-        with open(os.path.join(paths.output_pages, f"{data['reference']}.md"), "w", encoding="utf-8") as f:
-            f.write(template.render(data))
+def resolve_shacl_version(paths: ProjectPaths, refresh: bool = False) -> str:
+    """Commit-SHA van `shacl_versie`; de laatst herleide SHA staat in de cache (versies.json).
+
+    Zonder netwerk valt dit terug op de laatst bekende SHA, of op de ref zelf als die er nog niet is.
+    """
+    version = TTL_CONFIG["shacl_versie"]
+    if re.fullmatch(r"[0-9a-f]{40}", version): return version
+    state_path = os.path.join(paths.shacl_cache, "versies.json")
+    state = read_json(state_path, {})
+    known = state.get(version)
+    if known and not refresh and time.time() - known["tijd"] < TTL_CONFIG["shacl_ref_ttl"]:
+        return known["sha"]
+
+    import urllib.request
+    request = urllib.request.Request(TTL_CONFIG["shacl_commits"].format(versie=version),
+                                     headers={"Accept": "application/vnd.github.sha"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            sha = response.read().decode("ascii").strip()
+        if not re.fullmatch(r"[0-9a-f]{40}", sha): raise ValueError(f"onverwacht antwoord '{sha[:40]}'")
+    except (OSError, ValueError) as e:
+        if known:
+            print(f"LET OP: SHACL-versie '{version}' niet te herleiden ({e}), laatst bekende {known['sha'][:12]} wordt gebruikt.")
+            return known["sha"]
+        print(f"LET OP: SHACL-versie '{version}' niet te herleiden ({e}), de ref wordt ongepind gebruikt.")
+        return version
+
+    state[version] = {"sha": sha, "tijd": time.time()}
+    ensure_dir(state_path)
+    with open(state_path, "w", encoding="utf-8") as fh:
+        json.dump(state, fh)
+    return sha
+
+def cached_shapes_path(paths: ProjectPaths, version: Optional[str] = None) -> Tuple[str, str]:
+    """Sleutel en cachepad van het SHACL-profiel voor een commit (standaard: de herleide `shacl_versie`)."""
+    key = f"skos-ap-nl@{version or resolve_shacl_version(paths)}"
+    return key, os.path.join(paths.shacl_cache, f"{slugify(key)}.nt")
+
+def load_shapes(paths: ProjectPaths, refresh: bool = False) -> Tuple[Graph, str]:
+    """Levert de NL-SBB shapes-graaf plus een sleutel die de versie identificeert.
+
+    Het profiel wordt één keer per commit opgehaald en als N-Triples in de cache bewaard,
+    zodat builds daarna volledig offline werken; kopieën van andere versies worden opgeruimd.
+    Bij een mislukte download valt de generator terug op een eerder gecachte kopie.
+    """
+    source = TTL_CONFIG["shacl_profile"].format(versie=TTL_CONFIG["shacl_versie"])
+    if os.path.exists(source):
+        return Graph().parse(source, format="turtle"), file_hash(source)
+
+    version = resolve_shacl_version(paths, refresh)
+    source = TTL_CONFIG["shacl_profile"].format(versie=version)
+    key, cached = cached_shapes_path(paths, version)
+    print(f"SHACL-profiel: {key}")
+    if os.path.exists(cached) and not refresh:
+        return Graph().parse(cached, format="nt"), key
+
+    try:
+        shapes = Graph().parse(source, format="turtle")
+    except Exception as e:
+        if not os.path.exists(cached):
+            print(f"FOUT: SHACL-profiel niet te laden ({e}) en geen kopie in {paths.shacl_cache}.")
+            sys.exit(1)
+        print(f"LET OP: SHACL-profiel niet te verversen ({e}), gecachte kopie wordt gebruikt.")
+        return Graph().parse(cached, format="nt"), key
+
+    ensure_dir(cached)
+    shapes.serialize(destination=cached, format="nt", encoding="utf-8")
+    prune_cache(paths.shacl_cache, {os.path.basename(cached)}, pattern="skos-ap-nl*.nt")
+    return shapes, key
+
+def rdfs_closure(paths: ProjectPaths, digest: str, load: Callable[[], Graph]) -> Graph:
+    """RDFS-afsluiting van één bronbestand, gecachet op de hash van dat bestand.
+    
+    De bronbestanden bevatten alleen instantiedata (geen klassen of eigenschappen), dus de
+    vereniging van de afsluitingen per bestand is gelijk aan de afsluiting van het geheel.
+    """
+    cached = os.path.join(paths.shacl_cache, "afsluiting", f"{digest}.nt")
+    if os.path.exists(cached):
+        return Graph().parse(cached, format="nt")
+
+    import owlrl
+    from pyshacl.inference import CustomRDFSSemantics # Zelfde RDFS-variant als validate(inference='rdfs')
+    
+    closure = Graph()
+    closure += load()
+    owlrl.DeductiveClosure(CustomRDFSSemantics).expand(closure)
+    # RDFS leidt ook triples af met een literal als subject; die zijn niet in N-Triples uit te drukken
+    # en spelen geen rol bij de validatie (shapes richten zich op IRI's en blank nodes).
+    for triple in [t for t in closure if isinstance(t[0], Literal)]: closure.remove(triple)
+    ensure_dir(cached)
+    closure.serialize(destination=cached, format="nt", encoding="utf-8")
+    return closure
+
+def neighbourhood(graph: Graph, nodes: set) -> List[URIRef]:
+    """De knopen zelf plus alles wat ernaar verwijst of waarnaar zij verwijzen (binnen de graaf)."""
+    focus = set()
+    for node in (URIRef(n) for n in nodes):
+        if (node, None, None) not in graph: continue
+        focus.add(node)
+        focus.update(o for o in graph.objects(node) if isinstance(o, URIRef) and (o, None, None) in graph)
+        focus.update(s for s in graph.subjects(None, node) if isinstance(s, URIRef))
+    return sorted(focus)
+
+def validate_sources(graph: Graph, paths: ProjectPaths, incremental: bool = False,
+                     refresh_shapes: bool = False) -> Tuple[bool, str]:
+    """SHACL-validatie tegen het (gecachte) NL-SBB profiel.
+    
+    Incrementeel worden alleen de focusknopen gevalideerd uit bestanden die sinds de laatste
+    geslaagde run gewijzigd zijn (plus hun directe buren); zonder wijzigingen wordt de validatie
+    overgeslagen. De RDFS-afsluiting komt per bestand uit de cache, incrementeel alleen voor de
+    bestanden die de focusknopen en hun directe buren bevatten.
+    """
+    shapes, shapes_key = load_shapes(paths, refresh_shapes)
+    state_path = os.path.join(paths.shacl_cache, "validatie.json")
+    state = read_json(state_path, {})
+    previous = state.get("files", {}) if state.get("shapes") == shapes_key else {}
+    
+    files = {os.path.relpath(f, paths.ttl_source).replace(os.sep, "/"): f for f in source_files(paths)}
+    hashes = {key: file_hash(f) for key, f in files.items()}
+    changed = [key for key in files if previous.get(key, {}).get("hash") != hashes[key]]
+    removed = previous.keys() - files.keys()
+    incremental = incremental and bool(previous) and not removed
+    
+    if incremental and not changed:
+        print("SHACL: geen wijzigingen sinds de vorige geslaagde validatie.")
+        return True, ""
+
+    sources, file_state, touched = {}, {}, set()
+    for key, f in files.items():
+        if key in changed:
+            sources[key] = source_graph(paths, f)
+            subjects = sorted({str(s) for s in sources[key].subjects() if isinstance(s, URIRef)})
+            touched.update(subjects + previous.get(key, {}).get("subjects", []))
+            file_state[key] = {"hash": hashes[key], "subjects": subjects}
+        else:
+            file_state[key] = previous[key]
+
+    focus, needed = None, list(files)
+    if incremental:
+        focus = neighbourhood(graph, touched)
+        # Shapes kijken één stap verder dan de focusknopen (bv. het type van een broader-doel); alleen
+        # de afsluitingen van bestanden met die knopen als subject zijn nodig
+        reach = {str(n) for n in focus} | {str(o) for n in focus for o in graph.objects(n) if isinstance(o, URIRef)}
+        needed = [key for key in files if key in changed or reach.intersection(file_state[key]["subjects"])]
+        print(f"SHACL: {len(focus)} focusknopen uit {len(changed)} gewijzigde bestand(en), "
+              f"{len(needed)} van {len(files)} afsluitingen geladen.")
+
+    if focus == []:
+        valid, report = True, ""
+    else:
+        data = Graph()
+        for key in needed:
+            data += rdfs_closure(paths, hashes[key], lambda: sources[key] if key in sources else source_graph(paths, files[key]))
+        from pyshacl import validate
+        valid, _, report = validate(data, shacl_graph=shapes, inference="none", focus_nodes=focus)
+    prune_cache(os.path.join(paths.shacl_cache, "afsluiting"), {f"{digest}.nt" for digest in hashes.values()})
+
+    if valid:
+        ensure_dir(state_path)
+        with open(state_path, "w", encoding="utf-8") as fh:
+            json.dump({"shapes": shapes_key, "files": file_state}, fh)
+    return valid, report
+
+# ==============================================================================
+# 6. GENERATOREN
+# ==============================================================================
+
+def template_hash(env: Environment, name: str) -> str:
+    source, _, _ = env.loader.get_source(env, name)
+    return content_hash(name, source)
+
+class PageRenderer:
+    """Verwerkt en rendert begrippenpagina's. Draait in het hoofdproces of, met --jobs, één per worker."""
+    
+    def __init__(self, store: ConceptStore, lookup: dict, paths: ProjectPaths, options: BuildOptions,
+                 linker: Optional[ContentLinker] = None):
+        self.store = store
+        self.lookup = lookup
+        self.paths = paths
+        self.env = Environment(loader=FileSystemLoader(paths.templates))
+        self.load_template()
+        self.linker = linker or make_linker(lookup, paths, options)
+
+    def load_template(self):
+        self.template = self.env.get_template("begrip.md.jinja2")
+        self.tpl_hash = template_hash(self.env, self.template.name)
+
+    def page_path(self, data: dict) -> str:
+        return os.path.join(self.paths.output_pages, f"{data['reference']}.md")
+
+    def render_data(self, data: dict) -> Tuple[str, str, str]:
+        return self.page_path(data), content_hash(self.tpl_hash, data), self.template.render(data)
+
+    def render(self, concepts: List[ConceptRecord], links: Optional[Dict[str, set]] = None,
+               timings: Optional[Dict[str, float]] = None) -> List[Tuple[str, str, str]]:
+        """(pad, invoer-hash, inhoud) per begrip, in de volgorde van `concepts`."""
+        pages = []
+        for data in process_concepts(self.store, concepts, self.lookup, self.linker, links, timings):
+            started = time.perf_counter()
+            pages.append(self.render_data(data))
+            if timings is not None: timings[data["uri"]] += time.perf_counter() - started
+        return pages
 
-    # Aliassen (redirects)
-    print(f" - Aliassen: {paths.output_aliases}")
+_page_renderer: Optional[PageRenderer] = None # Per workerproces: spaCy-model en patronen één keer laden
+
+def _init_page_worker(store: ConceptStore, lookup: dict, paths: ProjectPaths, options: BuildOptions):
+    global _page_renderer
+    _page_renderer = PageRenderer(store, lookup, paths, options)
+
+def _render_page_chunk(concepts: List[ConceptRecord]) -> Tuple[List[Tuple[str, str, str]], Dict[str, float], Dict[str, int]]:
+    """Pagina's plus meetgegevens (tijd per begrip, autolink-tellers) van één brok."""
+    _page_renderer.linker.stats = dict.fromkeys(LINK_STATS, 0)
+    timings = {}
+    pages = _page_renderer.render(concepts, timings=timings)
+    return pages, timings, _page_renderer.linker.stats
+
+def page_jobs(options: BuildOptions, count: int) -> int:
+    return effective_jobs(options.jobs, count, JOBS_CONFIG["min_concepts"])
+
+def render_pages(renderer: PageRenderer, options: BuildOptions,
+                 timings: Optional[Dict[str, float]] = None) -> List[Tuple[str, str, str]]:
+    """Alle begrippenpagina's; bij `jobs > 1` (en genoeg begrippen) in brokken verdeeld over een procespool.
+    
+    Zelfde uitvoer als serieel. Met fork erven de workers het geladen model van het hoofdproces;
+    anders laadt elke worker het zelf (_init_page_worker).
+    
+    Autolink-tellers uit de workers worden opgeteld bij `renderer.linker.stats`.
+    """
+    concepts = renderer.store.concepts
+    jobs = page_jobs(options, len(concepts))
+    if jobs <= 1:
+        return renderer.render(concepts, timings=timings)
+
+    # Geen geneste procespools: spaCy draait binnen een worker altijd in-process
+    size = max(1, -(-len(concepts) // (jobs * 4)))
+    chunks = [concepts[i:i + size] for i in range(0, len(concepts), size)]
+    global _page_renderer
+    if multiprocessing.get_start_method() == "fork":
+        # Workers erven het geladen model en de gecompileerde patronen van het hoofdproces
+        _page_renderer, n_process = renderer, renderer.linker.n_process
+        renderer.linker.n_process = 1
+        try:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                results = list(pool.map(_render_page_chunk, chunks))
+        finally:
+            _page_renderer, renderer.linker.n_process = None, n_process
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_page_worker,
+                                 initargs=(renderer.store, renderer.lookup, renderer.paths, replace(options, n_process=1))) as pool:
+            results = list(pool.map(_render_page_chunk, chunks))
+    
+    for _, chunk_timings, stats in results:
+        if timings is not None: timings.update(chunk_timings)
+        for key, count in stats.items(): renderer.linker.stats[key] += count
+    return [page for pages, _, _ in results for page in pages]
+
+def make_linker(lookup: dict, paths: ProjectPaths, options: BuildOptions) -> ContentLinker:
+    return ContentLinker(lookup, batch_size=options.batch_size, n_process=options.n_process,
+                         engine=options.engine, link_labels=options.link_labels, cache_path=paths.pattern_cache)
+
+def write_homepage(env: Environment, store: ConceptStore, paths: ProjectPaths, manifest: BuildManifest):
+    scheme = store.scheme or ConceptRecord("")
+    title = scheme.first(NS["dct"].title) or "Begrippenkader"
+    desc = scheme.first(NS["rdfs"].comment) or ""
+    
+    template = env.get_template("index.md.jinja2")
+    manifest.write(paths.output_homepage, content_hash(template_hash(env, template.name), title, desc),
+                   lambda: template.render(naam=title, uitleg=desc))
+
+def write_aliases(env: Environment, lookup: dict, paths: ProjectPaths, manifest: BuildManifest):
     template = env.get_template("alias.md.jinja2")
-    ensure_dir(paths.output_aliases + "/")
+    tpl_hash = template_hash(env, template.name)
     
-    for concept in graph.subjects(RDF.type, NS["skos"].Concept):
-        uri = str(concept)
-        if uri not in lookup: continue
-        
-        target = lookup[uri]
-        for alias in graph.objects(concept, NS["skos"].altLabel):
-            slug = f"{slugify(str(alias))}-{target['reference']}"
-            with open(os.path.join(paths.output_aliases, f"{slug}.md"), "w", encoding="utf-8") as f:
-                f.write(template.render(alias_term=str(alias), target_label=target['label'], target_url=f"/doc/{target['reference']}"))
-
-    # JSON alfabetische nav
-    print(f" - Index: {paths.output_nav}")
+    for target in lookup.values():
+        for alias in target["alt_labels"]:
+            slug = f"{slugify(alias)}-{target['reference']}"
+            context = {"alias_term": alias, "target_label": target['label'], "target_url": f"/doc/{target['reference']}"}
+            manifest.write(os.path.join(paths.output_aliases, f"{slug}.md"), content_hash(tpl_hash, context),
+                           lambda: template.render(context))
+
+def write_nav(lookup: dict, paths: ProjectPaths, manifest: BuildManifest):
+    """Alfabetische nav: per beginletter een shard, plus een klein manifest met letter, aantal en versie."""
     index_items = []
-    for uri, data in lookup.items():
+    for data in lookup.values():
         url = f"/doc/{data['reference']}"
         # Voorkeursterm
         index_items.append({"title": data['label'], "url": url, "type": "concept", "sort": get_normalized_sort_key(data['label'])})
         # Alternatieve termen
-        for alias in graph.objects(URIRef(uri), NS["skos"].altLabel):
-            index_items.append({"title": str(alias), "url": url, "type": "alias", "target_label": data['label'], "sort": get_normalized_sort_key(str(alias))})
+        for alias in data["alt_labels"]:
+            index_items.append({"title": alias, "url": url, "type": "alias", "target_label": data['label'], "sort": get_normalized_sort_key(alias)})
     
-    index_items.sort(key=lambda x: x.pop('sort')) # Sorteer en verwijder direct de sort key
-    ensure_dir(paths.output_nav)
-    with open(paths.output_nav, "w", encoding="utf-8") as f:
-        json.dump(index_items, f, separators=(',', ':'))
+    index_items.sort(key=lambda x: x['sort'])
+    shards: Dict[str, list] = {}
+    for item in index_items:
+        shards.setdefault(shard_key(item.pop('sort'), 1), []).append(item)
 
-    # Downloadable TTL
-    print(" - Exports (TTL/JSON)")
+    letters = []
+    for letter, items in shards.items():
+        digest = content_hash(items)
+        manifest.write(os.path.join(paths.output_nav, f"{letter}.json"), digest, lambda: json.dumps(items, separators=(',', ':')))
+        letters.append({"letter": letter, "aantal": len(items), "v": digest[:12]})
+    manifest.write(os.path.join(paths.output_nav, "index.json"), content_hash(letters),
+                   lambda: json.dumps(letters, separators=(',', ':')))
+
+def write_nav_tree(store: ConceptStore, lookup: dict, paths: ProjectPaths, manifest: BuildManifest):
+    """Hiërarchische nav als statische include (JTD-markup), via nav_footer_custom.html in de zijbalk.
+    
+    Vervangt de collectie-nav van just-the-docs, die Jekyll per pagina opnieuw uit de parent-relaties
+    opbouwt; bij duizenden begrippen is dat het grootste deel van de Jekyll-tijd.
+    """
+    hierarchy = store.hierarchy
+    children = hierarchy.children["broader"]
+    
+    def node(uri: str) -> list:
+        return [lookup[uri]["reference"], lookup[uri]["label"], []]
+    
+    # Iteratief opbouwen: diepe hiërarchieën halen zo de recursielimiet niet
+    tree = [node(uri) for uri in hierarchy.roots("broader", lookup)]
+    stack = list(zip(hierarchy.roots("broader", lookup), tree))
+    while stack:
+        uri, entry = stack.pop()
+        for child in children.get(uri, ()):
+            entry[2].append(node(child))
+            stack.append((child, entry[2][-1]))
+    
+    lines = ['<div class="nav-category">Begrippen</div>']
+    todo = [("open", tree)]
+    while todo:
+        action, item = todo.pop()
+        if action == "open":
+            lines.append('<ul class="nav-list">')
+            todo.append(("close", None))
+            todo.extend(("item", entry) for entry in reversed(item))
+        elif action == "item":
+            reference, label, sub = item
+            lines.append('<li class="nav-list-item">')
+            if sub:
+                lines.append(f'<button class="nav-list-expander btn-reset" aria-label="{html.escape(label)} uitklappen">'
+                             '<svg viewBox="0 0 24 24" aria-hidden="true"><use xlink:href="#svg-arrow-right"></use></svg></button>')
+            lines.append(f'<a href="{{{{ site.baseurl }}}}/doc/{reference}" class="nav-list-link">{html.escape(label)}</a>')
+            todo.append(("end", None))
+            if sub: todo.append(("open", sub))
+        elif action == "end":
+            lines.append('</li>')
+        else:
+            lines.append('</ul>')
+    
+    manifest.write(paths.output_nav_include, content_hash(tree), lambda: "\n".join(lines) + "\n")
+
+def write_search_index(store: ConceptStore, lookup: dict, paths: ProjectPaths, manifest: BuildManifest):
+    """Voorberekende, geshardde inverted index voor het zoeken in de browser.
+    
+    Tokens uit voorkeurs-, alternatieve en zoektermen en definities (accenten gevouwen) verwijzen
+    naar (begrip-id, veldgewicht). De browser laadt het manifest, daarna alleen de shard(s) van
+    de eerste tekens van de zoekterm en tokens die daar met de zoekterm beginnen (prefix-zoeken).
+    """
+    weights = SEARCH_CONFIG["weights"]
+    stopwords = SEARCH_CONFIG["stopwords"]
+    docs, postings = [], {}
+    for doc_id, (uri, data) in enumerate(lookup.items()):
+        docs.append([data["label"], data["reference"]])
+        fields = {"prefLabel": [data["label"]], "altLabel": data["alt_labels"], "hiddenLabel": data["hidden_labels"],
+                  "definition": store.records[uri].all(NS["skos"].definition)}
+        for field, texts in fields.items():
+            for token in (t for text in texts for t in search_tokens(text)):
+                if len(token) < 2 or (field == "definition" and token in stopwords): continue
+                entry = postings.setdefault(token, {})
+                entry[doc_id] = max(entry.get(doc_id, 0), weights[field])
+
+    shards: Dict[str, dict] = {}
+    for token in sorted(postings):
+        # Compact: per token een platte lijst [id, gewicht, id, gewicht, ...]
+        shards.setdefault(shard_key(token, SEARCH_CONFIG["shard_prefix"]), {})[token] = \
+            [n for doc_id, weight in sorted(postings[token].items()) for n in (doc_id, weight)]
+
+    index = {"prefix": SEARCH_CONFIG["shard_prefix"], "chunk": SEARCH_CONFIG["doc_chunk"], "aantal": len(docs),
+             "shards": {}, "docs": []}
+    for key, shard in shards.items():
+        digest = content_hash(shard)
+        manifest.write(os.path.join(paths.output_search, f"t-{key}.json"), digest, lambda: json.dumps(shard, separators=(',', ':')))
+        index["shards"][key] = digest[:12]
+    for n in range(0, len(docs), SEARCH_CONFIG["doc_chunk"]):
+        chunk = docs[n:n + SEARCH_CONFIG["doc_chunk"]]
+        digest = content_hash(chunk)
+        manifest.write(os.path.join(paths.output_search, f"d-{n // SEARCH_CONFIG['doc_chunk']}.json"), digest,
+                       lambda: json.dumps(chunk, separators=(',', ':'), ensure_ascii=False))
+        index["docs"].append(digest[:12])
+    manifest.write(os.path.join(paths.output_search, "index.json"), content_hash(index),
+                   lambda: json.dumps(index, separators=(',', ':')))
+
+# --- Exports ---
+
+class CompressingWriter:
+    """Binaire stream die in één doorgang naar het exportbestand én de .gz/.br-varianten schrijft.
+    
+    Er wordt naar .tmp-bestanden geschreven die pas bij een geslaagde close op hun plek komen.
+    """
+    
+    def __init__(self, path: str, formats: Tuple[str, ...]):
+        ensure_dir(path)
+        self.targets = [path] + [f"{path}.{fmt}" for fmt in formats]
+        self.files = [open(f"{target}.tmp", "wb") for target in self.targets]
+        self.raw = self.files[0]
+        self.gz = gzip.GzipFile(filename="", mode="wb", compresslevel=EXPORT_CONFIG["gzip_level"], mtime=0,
+                                fileobj=self.files[formats.index("gz") + 1]) if "gz" in formats else None
+        self.br = brotli.Compressor(quality=EXPORT_CONFIG["brotli_quality"]) if "br" in formats else None
+        self.br_file = self.files[formats.index("br") + 1] if "br" in formats else None
+
+    def write(self, data: Union[bytes, str]) -> int:
+        if isinstance(data, str): data = data.encode("utf-8")
+        self.raw.write(data)
+        if self.gz: self.gz.write(data)
+        if self.br: self.br_file.write(self.br.process(data))
+        return len(data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *_):
+        if self.gz: self.gz.close()
+        if self.br: self.br_file.write(self.br.finish())
+        for f in self.files: f.close()
+        for target in self.targets:
+            if exc_type is None: os.replace(f"{target}.tmp", target)
+            else: os.remove(f"{target}.tmp")
+
+def export_formats() -> Tuple[str, ...]:
+    return tuple(fmt for fmt in EXPORT_CONFIG["compress"] if fmt != "br" or brotli is not None)
+
+def write_export(manifest: BuildManifest, path: str, digest: str, produce: Callable[[CompressingWriter], None]) -> List[Tuple[str, bool]]:
+    """Schrijft een export plus gecomprimeerde varianten, tenzij de invoer-hash ongewijzigd is.
+    
+    Levert (pad, geschreven) per bestand, voor de checksumlijst.
+    """
+    targets = [path] + [f"{path}.{fmt}" for fmt in export_formats()]
+    if all([manifest.keep(target, digest) for target in targets]): # Lijst: alle doelen registreren
+        manifest.skipped += len(targets)
+        return [(target, False) for target in targets]
+    
+    with CompressingWriter(path, export_formats()) as out:
+        produce(out)
+    manifest.written += len(targets)
+    return [(target, True) for target in targets]
+
+def write_json_stream(out: CompressingWriter, items: Dict[str, Any]):
+    """Compacte JSON-object-export, entry voor entry naar de stream."""
+    out.write("{")
+    for n, (key, value) in enumerate(items.items()):
+        out.write(("," if n else "") + json.dumps(key) + ":" + json.dumps(value, separators=(",", ":"), ensure_ascii=False))
+    out.write("}")
+
+# Tabellen van de SQLite-export. Labels staan alleen in `label`, niet nogmaals in `tekst`.
+SQLITE_SCHEMA = """
+CREATE TABLE begrip (
+    id          INTEGER PRIMARY KEY,
+    uri         TEXT NOT NULL UNIQUE,
+    referentie  TEXT NOT NULL UNIQUE,
+    label       TEXT NOT NULL,
+    status      TEXT,
+    code        TEXT,
+    definitie   TEXT,
+    url         TEXT NOT NULL
+);
+CREATE TABLE label (
+    begrip      INTEGER NOT NULL REFERENCES begrip(id),
+    soort       TEXT NOT NULL,              -- prefLabel, altLabel of hiddenLabel
+    label       TEXT NOT NULL,
+    sleutel     TEXT NOT NULL               -- kleine letters zonder accenten (get_normalized_sort_key)
+);
+CREATE INDEX label_sleutel ON label(sleutel);
+CREATE INDEX label_begrip ON label(begrip);
+CREATE TABLE tekst (
+    begrip      INTEGER NOT NULL REFERENCES begrip(id),
+    veld        TEXT NOT NULL,              -- sleutel uit BEGRIPPEN_SCHEMA, bv. toelichting
+    waarde      TEXT NOT NULL
+);
+CREATE INDEX tekst_begrip ON tekst(begrip, veld);
+CREATE TABLE relatie (
+    bron        INTEGER NOT NULL REFERENCES begrip(id),
+    veld        TEXT NOT NULL,              -- bv. heeft_bovenliggend_begrip
+    predicaat   TEXT NOT NULL,
+    doel        INTEGER NOT NULL REFERENCES begrip(id)
+);
+CREATE INDEX relatie_bron ON relatie(bron, veld);
+CREATE INDEX relatie_doel ON relatie(doel, veld);
+CREATE TABLE extern (
+    begrip      INTEGER NOT NULL REFERENCES begrip(id),
+    veld        TEXT NOT NULL,              -- bv. is_exact_overeenkomstig of heeft_bron
+    predicaat   TEXT NOT NULL,
+    uri         TEXT NOT NULL,
+    label       TEXT NOT NULL,
+    url         TEXT NOT NULL
+);
+CREATE INDEX extern_begrip ON extern(begrip, veld);
+CREATE INDEX extern_uri ON extern(uri);
+CREATE TABLE hierarchie (                   -- transitieve afsluiting per soort (zie HIERARCHIEEN)
+    begrip      INTEGER NOT NULL REFERENCES begrip(id),
+    soort       TEXT NOT NULL,
+    voorouder   INTEGER NOT NULL REFERENCES begrip(id),
+    PRIMARY KEY (begrip, soort, voorouder)
+) WITHOUT ROWID;
+CREATE INDEX hierarchie_voorouder ON hierarchie(voorouder, soort);
+CREATE VIRTUAL TABLE zoek USING fts5(       -- rowid = begrip.id
+    label, termen, definitie, teksten,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+def build_sqlite(stores: Iterable[ConceptStore], lookup: dict, path: str):
+    """Schrijft het begrippenkader als geïndexeerde SQLite-database (zie SQLITE_SCHEMA).
+    
+    Gebouwd uit de lookup en het conceptmodel, dus met dezelfde selectie en labels als de site;
+    `stores` is het volledige model of (streamingmodus) één model per bronbestand.
+    Zoeken: `SELECT rowid FROM zoek WHERE zoek MATCH 'netbeheerder*' ORDER BY bm25(zoek, 8, 4, 1, 1)`.
+    """
+    if os.path.exists(path): os.remove(path)
+    ids = {uri: n for n, uri in enumerate(lookup, 1)}
+    label_fields = {str(NS["skos"].altLabel), str(NS["skos"].hiddenLabel)}
+    
+    con = sqlite3.connect(path)
+    try:
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        con.executescript(SQLITE_SCHEMA)
+        with con:
+            for store, record in ((store, c) for store in stores for c in store.concepts if c.uri in lookup):
+                uri, data, id_ = record.uri, lookup[record.uri], ids[record.uri]
+                status = record.first(NS["adms"].status)
+                definition = record.first(NS["skos"].definition)
+                con.execute("INSERT INTO begrip VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                            (id_, uri, data["reference"], data["label"], status.split("/")[-1] if status else None,
+                             record.first(NS["skos"].notation), definition,
+                             f"{TTL_CONFIG['base']}/doc/{data['reference']}"))
+                
+                labels = [("prefLabel", data["label"])] + [("altLabel", l) for l in data["alt_labels"]] \
+                         + [("hiddenLabel", l) for l in data["hidden_labels"]]
+                con.executemany("INSERT INTO label VALUES (?, ?, ?, ?)",
+                                [(id_, kind, label, get_normalized_sort_key(label.strip())) for kind, label in labels])
+                
+                texts = []
+                for key, config in BEGRIPPEN_SCHEMA.items():
+                    pred = str(config.predicaat)
+                    values = record.all(pred)
+                    if config.type is VeldType.TEKST_LIJST and pred not in label_fields:
+                        texts += [(id_, key, value) for value in values]
+                    elif config.type is VeldType.LINK_INTERN:
+                        con.executemany("INSERT INTO relatie VALUES (?, ?, ?, ?)",
+                                        [(id_, key, pred, ids[target]) for target in store.hierarchy.links[pred].get(uri, [])])
+                    elif config.type is VeldType.LINK_EXTERN:
+                        con.executemany("INSERT INTO extern VALUES (?, ?, ?, ?, ?, ?)",
+                                        [(id_, key, pred, target, link["label"], link["url"])
+                                         for target, link in ((t, store.link(t)) for t in values)])
+                con.executemany("INSERT INTO tekst VALUES (?, ?, ?)", texts)
+                
+                for kind in HIERARCHIEEN:
+                    con.executemany("INSERT INTO hierarchie VALUES (?, ?, ?)",
+                                    [(id_, kind, ids[a]) for a in sorted(store.hierarchy.ancestors(uri, kind), key=ids.get)])
+                
+                con.execute("INSERT INTO zoek(rowid, label, termen, definitie, teksten) VALUES (?, ?, ?, ?, ?)",
+                            (id_, data["label"], " ".join(data["alt_labels"] + data["hidden_labels"]), definition or "",
+                             " ".join(value for _, _, value in texts)))
+        con.execute("INSERT INTO zoek(zoek) VALUES ('optimize')")
+        con.commit()
+    finally:
+        con.close()
+
+def bind_export_namespaces(graph: Graph) -> Graph:
     graph.bind("", Namespace(TTL_CONFIG["prefix"]))
     for prefix, ns in NS.items(): graph.bind(prefix, ns)
-    graph.serialize(destination=paths.output_ttl, format="turtle", base=TTL_CONFIG["base"])
+    return graph
+
+class StreamTurtleSerializer(TurtleSerializer):
+    """Turtle voor grafen die achter elkaar in één bestand komen: elke @base/@prefix alleen de eerste keer.
+    
+    `declared` wordt gedeeld door de serializers van één bestand; een prefix die een andere URI
+    krijgt, wordt opnieuw gedeclareerd (Turtle staat dat toe).
+    """
+    def __init__(self, store: Graph, declared: Dict[str, str]):
+        super().__init__(store)
+        self.declared = declared
+
+    def startDocument(self):
+        self._started = True
+        if self.base and self.declared.get("@base") != self.base:
+            self.write(f"@base <{self.base}> .\n")
+            self.declared["@base"] = self.base
+        for prefix, uri in sorted(self.namespaces.items()):
+            if self.declared.get(prefix) != str(uri):
+                self.write(f"@prefix {prefix}: <{uri}> .\n")
+                self.declared[prefix] = str(uri)
+
+def write_turtle_stream(out: CompressingWriter, graphs: Iterable[Graph]):
+    """Turtle uit losse grafen, met één gezamenlijke kop voor de exportnamespaces (zie bind_export_namespaces)."""
+    declared = {"@base": TTL_CONFIG["base"], "": TTL_CONFIG["prefix"], **{prefix: str(ns) for prefix, ns in NS.items()}}
+    header = [f"@base <{declared['@base']}> ."] + [f"@prefix {prefix}: <{uri}> ." for prefix, uri in sorted(declared.items()) if prefix != "@base"]
+    out.write(("\n".join(header) + "\n").encode("utf-8"))
+    for graph in graphs:
+        StreamTurtleSerializer(graph, declared).serialize(out, base=TTL_CONFIG["base"], encoding="utf-8")
+
+def write_jsonld_stream(out: CompressingWriter, graphs: Iterable[Graph], context: dict):
+    """JSON-LD uit losse grafen: de knopen van elke graaf komen in één gezamenlijke @graph."""
+    out.write('{"@context":' + json.dumps(context) + ',"@graph":[')
+    first = True
+    for graph in graphs:
+        doc = json.loads(graph.serialize(format="json-ld", context=context))
+        nodes = doc["@graph"] if "@graph" in doc else [{key: value for key, value in doc.items() if key != "@context"}]
+        for node in nodes:
+            out.write(("" if first else ",") + json.dumps(node, ensure_ascii=False))
+            first = False
+    out.write("]}")
 
-    # Downloadable lookup JSON
+def write_exports(graph: Optional[Graph], store: ConceptStore, lookup: dict, paths: ProjectPaths, manifest: BuildManifest,
+                  source: Optional[StreamSource] = None):
+    """Downloads: Turtle, N-Triples, JSON-LD, compacte JSON en SQLite, elk met .gz/.br en een checksumlijst.
+    
+    De hashes hangen af van de bronbestanden (niet van de serialisatie), zodat ongewijzigde exports
+    worden overgeslagen zonder de graaf te serialiseren. N-Triples en JSON gaan rechtstreeks naar
+    schijf; geen enkele export wordt eerst als string opgebouwd.
+    
+    In de streamingmodus (`source`, geen `graph`) wordt elke bron apart geserialiseerd en achter
+    elkaar geschreven (Turtle met één kop van prefixen): dezelfde graaf, maar niet byte-voor-byte
+    dezelfde RDF-bestanden.
+    """
+    sources = content_hash([file_hash(f) for f in source_files(paths)], TTL_CONFIG["base"], TTL_CONFIG["prefix"],
+                           {prefix: str(ns) for prefix, ns in NS.items()}, rdflib.__version__, EXPORT_CONFIG)
+    context = {prefix: str(ns) for prefix, ns in [("", TTL_CONFIG["prefix"]), *NS.items()] if prefix}
+    if source is None:
+        bind_export_namespaces(graph)
+        graphs = lambda: [graph]
+    else:
+        graphs = lambda: (bind_export_namespaces(g) for g in source.graphs())
+    rdf = content_hash(sources, "graaf" if source is None else "stream")
+    def serialize(out: CompressingWriter, fmt: str, **kwargs):
+        for g in graphs(): g.serialize(destination=out, format=fmt, encoding="utf-8", **kwargs)
+
+    files = []
+    if source is None:
+        files += write_export(manifest, paths.output_ttl, content_hash("turtle", rdf),
+                              lambda out: serialize(out, "turtle", base=TTL_CONFIG["base"]))
+    else:
+        files += write_export(manifest, paths.output_ttl, content_hash("turtle", rdf, "prefixen-eenmalig"),
+                              lambda out: write_turtle_stream(out, graphs()))
+    files += write_export(manifest, paths.output_nt, content_hash("nt", rdf), lambda out: serialize(out, "nt"))
+    if source is None:
+        files += write_export(manifest, paths.output_jsonld, content_hash("json-ld", rdf),
+                              lambda out: graph.serialize(destination=out, format="json-ld", context=context, encoding="utf-8"))
+    else:
+        files += write_export(manifest, paths.output_jsonld, content_hash("json-ld", rdf),
+                              lambda out: write_jsonld_stream(out, graphs(), context))
+
+    # Opzoektabel referentie -> label/URI
     lookup_export = {uri.replace(TTL_CONFIG["prefix"], ""): {"label": data["label"], "uri": uri} for uri, data in lookup.items()}
-    with open(paths.output_json, "w", encoding="utf-8") as f:
-        json.dump(lookup_export, f, indent=2)
+    files += write_export(manifest, paths.output_json, content_hash("json", lookup_export),
+                          lambda out: write_json_stream(out, lookup_export))
+
+    # Geïndexeerde database (labels, relaties, afsluiting, FTS5) voor integraties zonder rdflib
+    def produce_sqlite(out: CompressingWriter):
+        build = f"{paths.output_sqlite}.bouw"
+        build_sqlite([store] if source is None else source.stores(), lookup, build)
+        try:
+            with open(build, "rb") as f:
+                shutil.copyfileobj(f, out)
+        finally:
+            os.remove(build)
+    files += write_export(manifest, paths.output_sqlite, content_hash("sqlite", sources, SQLITE_SCHEMA, sqlite3.sqlite_version),
+                          produce_sqlite)
+
+    # Checksums (sha256sum-formaat); voor overgeslagen exports uit de vorige lijst
+    previous = {}
+    if os.path.exists(paths.output_checksums):
+        with open(paths.output_checksums, encoding="utf-8") as f:
+            previous = {name: digest for digest, name in (line.split("  ", 1) for line in f.read().splitlines() if line)}
+    checksums = []
+    for path, written in files:
+        name = os.path.basename(path)
+        checksums.append(f"{previous[name] if not written and name in previous else file_hash(path)}  {name}")
+    lines = "\n".join(sorted(checksums, key=lambda line: line.split("  ", 1)[1])) + "\n"
+    manifest.write(paths.output_checksums, content_hash(lines), lambda: lines)
+
+def generate_site(graph: Optional[Graph], store: ConceptStore, paths: ProjectPaths, options: BuildOptions = BuildOptions(),
+                  profile: Optional[BuildProfile] = None, steps: Tuple[str, ...] = COMMANDS["all"],
+                  source: Optional[StreamSource] = None) -> dict:
+    """Schrijft (de gevraagde stappen van) de site; levert de lookup (voor het profielrapport).
+    
+    Bij een deelrun blijft de overige uitvoer in het manifest staan en wordt alleen verouderde
+    uitvoer van de eigen stappen opgeruimd. In de streamingmodus is `store` het skelet uit
+    load_skeleton en worden pagina's en exports per bronbestand uit `source` gemaakt.
+    """
+    profile = profile or BuildProfile()
+    partial = tuple(steps) != COMMANDS["all"]
+    env = Environment(loader=FileSystemLoader(paths.templates))
+    manifest = BuildManifest(paths.output_manifest, paths.root, options.incremental, carry_over=partial)
+    with profile.phase("index"):
+        lookup = build_index(store)
+    
+    linker = None
+    if "begrippen" in steps:
+        # Ook bij --jobs compileert het hoofdproces eerst, zodat de workers de patronen uit de cache halen
+        with profile.phase("compileren"):
+            linker = make_linker(lookup, paths, options)
+        print(f" - Autolink-patronen: {linker.cache_hits} uit cache, {linker.cache_misses} nieuw getagd")
+    
+    if "homepage" in steps:
+        print(f" - Homepage: {paths.output_homepage}")
+        with profile.phase("homepage"):
+            write_homepage(env, store, paths, manifest)
+
+    if "begrippen" in steps and source is None:
+        jobs = page_jobs(options, len(store.concepts))
+        print(f" - Begrippen: {paths.output_pages}" + (f" ({jobs} processen)" if jobs > 1 else ""))
+        with profile.phase("begrippen"):
+            renderer = PageRenderer(store, lookup, paths, options, linker)
+            for path, digest, content in render_pages(renderer, options, profile.concept_times):
+                manifest.write(path, digest, lambda: content)
+    elif "begrippen" in steps:
+        print(f" - Begrippen: {paths.output_pages} (per bronbestand)")
+        with profile.phase("begrippen"):
+            renderer = PageRenderer(store, lookup, paths, options, linker)
+            for file_store in source.stores():
+                renderer.store = file_store
+                for path, digest, content in renderer.render(file_store.concepts, timings=profile.concept_times):
+                    manifest.write(path, digest, lambda: content)
+
+    if "aliassen" in steps:
+        print(f" - Aliassen: {paths.output_aliases}")
+        with profile.phase("aliassen"):
+            write_aliases(env, lookup, paths, manifest)
+
+    if "nav" in steps:
+        print(f" - Index: {paths.output_nav}")
+        with profile.phase("nav"):
+            write_nav(lookup, paths, manifest)
+
+    if "navboom" in steps:
+        print(f" - Navigatieboom: {paths.output_nav_include}")
+        with profile.phase("navboom"):
+            write_nav_tree(store, lookup, paths, manifest)
+
+    if "zoekindex" in steps:
+        print(f" - Zoekindex: {paths.output_search}")
+        with profile.phase("zoekindex"):
+            write_search_index(store, lookup, paths, manifest)
+
+    if "exports" in steps:
+        print(" - Exports (TTL/N-Triples/JSON-LD/JSON/SQLite)")
+        with profile.phase("exports"):
+            write_exports(graph, store, lookup, paths, manifest, source)
+
+    # Opruimen en verslag
+    with profile.phase("opruimen"):
+        manifest.remove_stale(tuple(p for step in steps for p in STEP_OUTPUTS[step]) if partial else "")
+        manifest.save()
+    print(f" - Uitvoer: {manifest.written} geschreven, {manifest.skipped} ongewijzigd overgeslagen, {manifest.removed} verwijderd")
+    
+    profile.counts.update(geindexeerd=len(lookup), geschreven=manifest.written, overgeslagen=manifest.skipped,
+                          verwijderd=manifest.removed)
+    if linker: profile.autolink.update(linker.stats)
+    return lookup
+
+# --- Watch-modus ---
+
+class LiveSite:
+    """Warme generatorstaat voor de watch-modus.
+    
+    Houdt model, linker en verwerkte pagina's in het geheugen, plus een omgekeerde
+    afhankelijkheidsindex: per URI (begrip of externe bron) de pagina's die ernaar verwijzen via
+    autolinks, interne relaties of externe links. Bij een wijziging worden alleen de geraakte
+    pagina's opnieuw verwerkt; aliassen en nav gaan via de manifest-hashes. De exports (serialiseren
+    en comprimeren van de hele graaf) blijven buiten die route: `write_exports` schrijft ze bij
+    zodra het stil is en bij het stoppen.
+    """
+    
+    DEPENDENCY_TYPES = (VeldType.LINK_INTERN, VeldType.LINK_EXTERN)
+    
+    def __init__(self, paths: ProjectPaths, options: BuildOptions):
+        self.paths = paths
+        self.options = replace(options, incremental=True, jobs=1)
+        self.env = Environment(loader=FileSystemLoader(paths.templates))
+        self.pages: Dict[str, dict] = {}          # begrip-URI -> verwerkte paginadata
+        self.dependencies: Dict[str, set] = {}    # begrip-URI -> URI's waar de pagina van afhangt
+        self.dependents: Dict[str, set] = {}      # URI -> begrip-URI's die ervan afhangen
+        self.exports_stale = False                # Bronnen gewijzigd sinds de laatste exports
+
+    def _load(self):
+        self.graph, self.store = load_vocabulary(self.paths, self.options.jobs)
+        self.store.usages = load_usages(self.options.usage_registers)
+        self.lookup = build_index(self.store)
+        self.urls = {f"/doc/{data['reference']}": uri for uri, data in self.lookup.items()}
+
+    def build(self):
+        """Eerste (incrementele) volledige build."""
+        self._load()
+        self.renderer = PageRenderer(self.store, self.lookup, self.paths, self.options)
+        manifest = BuildManifest(self.paths.output_manifest, self.paths.root, incremental=True)
+        self._write_pages(manifest, list(self.lookup))
+        self._write_rest(manifest)
+        write_exports(self.graph, self.store, self.lookup, self.paths, manifest)
+        manifest.remove_stale()
+        manifest.save()
+        return manifest
+
+    def update(self, changed: set) -> Tuple[BuildManifest, int]:
+        """Verwerkt gewijzigde bronbestanden/templates; levert het manifest en het aantal herverwerkte begrippen."""
+        manifest = BuildManifest(self.paths.output_manifest, self.paths.root, incremental=True, carry_over=True)
+        affected, rerender = set(), False
+        
+        if any(f.endswith((".ttl", ".json")) for f in changed):
+            old_store, old_lookup = self.store, self.lookup
+            self._load()
+            self.exports_stale = True
+            affected = self._affected(old_store, old_lookup)
+            for uri in old_lookup.keys() - self.lookup.keys():
+                manifest.remove(self.renderer.page_path(self.pages.pop(uri)))
+                self._set_dependencies(uri, set())
+        if any(os.path.basename(f) == "begrip.md.jinja2" for f in changed):
+            self.renderer.load_template()
+            rerender = True
+
+        self._write_pages(manifest, sorted(affected))
+        if rerender:
+            for data in self.pages.values():
+                path, digest, content = self.renderer.render_data(data)
+                manifest.write(path, digest, lambda: content)
+        self._write_rest(manifest)
+        manifest.remove_stale(prefix=("alias/", "assets/json/"))
+        manifest.save()
+        return manifest, len(affected)
+
+    def _affected(self, old_store: ConceptStore, old_lookup: dict) -> set:
+        """Begrip-URI's waarvan de pagina opnieuw verwerkt moet worden na een herlaad."""
+        old, new = old_store.records, self.store.records
+        changed = {uri for uri in old.keys() | new.keys()
+                   if (old[uri].values if uri in old else None) != (new[uri].values if uri in new else None)
+                   or old_store.usage(uri) != self.store.usage(uri)}
+        relabelled = {uri for uri in old_lookup.keys() | self.lookup.keys() if old_lookup.get(uri) != self.lookup.get(uri)}
+        
+        # Verschoven of anders gerelateerd: kruimelpad of (van beide kanten aangevulde) interne relaties anders
+        old_h, new_h = old_store.hierarchy, self.store.hierarchy
+        moved = {uri for uri in self.lookup.keys() & old_lookup.keys()
+                 if any(old_h.path(uri, kind) != new_h.path(uri, kind) for kind in HIERARCHIEEN)
+                 or any(old_h.links[pred].get(uri) != new_h.links[pred].get(uri) for pred in INTERNE_INVERSEN)}
+        
+        affected = changed | relabelled | moved
+        for uri in changed | relabelled:
+            affected |= self.dependents.get(uri, set())
+        if relabelled:
+            self.renderer.linker.recompile(self.lookup)
+            affected |= self._text_candidates(relabelled)
+        self.renderer.store, self.renderer.lookup = self.store, self.lookup
+        return {uri for uri in affected if uri in self.lookup}
+
+    def _text_candidates(self, uris: set) -> set:
+        """Begrippen waarvan een autolink-tekst een (nieuw) label van `uris` zou kunnen bevatten."""
+        linker = self.renderer.linker
+        targets = {f"/doc/{self.lookup[uri]['reference']}" for uri in uris if uri in self.lookup}
+        forms = [f for term, f in linker.term_forms.items() if linker.url_map[term] in targets]
+        if not forms: return set()
+        
+        fields = [config.predicaat for config in BEGRIPPEN_SCHEMA.values() if config.auto_link]
+        candidates = set()
+        for concept in self.store.concepts:
+            text = " ".join(t for pred in fields for t in concept.all(pred)).lower()
+            if any(all(any(form in text for form in options) for options in label) for label in forms):
+                candidates.add(concept.uri)
+        return candidates
+
+    def _set_dependencies(self, uri: str, deps: set):
+        for dep in self.dependencies.get(uri, set()) - deps:
+            self.dependents[dep].discard(uri)
+        for dep in deps:
+            self.dependents.setdefault(dep, set()).add(uri)
+        self.dependencies[uri] = deps
+
+    def _write_pages(self, manifest: BuildManifest, uris: List[str]):
+        concepts = [self.store.records[uri] for uri in uris]
+        links: Dict[str, set] = {}
+        for data in process_concepts(self.store, concepts, self.lookup, self.renderer.linker, links):
+            uri = data["uri"]
+            deps = {self.urls[url] for url in links.get(uri, ()) if url in self.urls}
+            for config in BEGRIPPEN_SCHEMA.values():
+                if config.type in self.DEPENDENCY_TYPES: deps.update(self.store.records[uri].all(config.predicaat))
+            for kind in HIERARCHIEEN:
+                deps.update(self.store.hierarchy.path(uri, kind))
+            for pred in INTERNE_INVERSEN:
+                deps.update(self.store.hierarchy.links[pred].get(uri, []))
+            self._set_dependencies(uri, deps)
+            
+            self.pages[uri] = data
+            path, digest, content = self.renderer.render_data(data)
+            manifest.write(path, digest, lambda: content)
+
+    def _write_rest(self, manifest: BuildManifest):
+        write_homepage(self.env, self.store, self.paths, manifest)
+        write_aliases(self.env, self.lookup, self.paths, manifest)
+        write_nav(self.lookup, self.paths, manifest)
+        write_nav_tree(self.store, self.lookup, self.paths, manifest)
+        write_search_index(self.store, self.lookup, self.paths, manifest)
+
+    def write_exports(self) -> BuildManifest:
+        """Schrijft de exports bij voor de huidige staat (alleen wat volgens de hashes gewijzigd is)."""
+        manifest = BuildManifest(self.paths.output_manifest, self.paths.root, incremental=True, carry_over=True)
+        write_exports(self.graph, self.store, self.lookup, self.paths, manifest)
+        manifest.save()
+        self.exports_stale = False
+        return manifest
+
+def watch_snapshot(paths: ProjectPaths, options: BuildOptions) -> Dict[str, Tuple[int, int]]:
+    files = source_files(paths) + sorted(glob.glob(os.path.join(paths.templates, "*.jinja2")))
+    files += sorted(f for pattern in options.usage_registers for f in glob.glob(pattern))
+    return file_snapshot(files)
+
+def file_snapshot(files: List[str]) -> Dict[str, Tuple[int, int]]:
+    snapshot = {}
+    for f in files:
+        try:
+            stat = os.stat(f)
+            snapshot[f] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+    return snapshot
+
+def flush_exports(site: LiveSite):
+    started = time.perf_counter()
+    manifest = site.write_exports()
+    print(f" - Exports: {manifest.written} geschreven ({(time.perf_counter() - started) * 1000:.0f} ms)")
+
+def watch(paths: ProjectPaths, options: BuildOptions, interval: float = 0.2, export_delay: float = 5.0):
+    """Bewaakt begrippenkader/*.ttl, templates/*.jinja2 en de gebruiksregisters en regenereert alleen de geraakte uitvoer.
+    
+    De exports worden pas bijgewerkt als er `export_delay` seconden geen wijzigingen meer kwamen,
+    en bij het stoppen, zodat een update alleen pagina's, aliassen en nav raakt.
+    """
+    site = LiveSite(paths, options)
+    try:
+        manifest = site.build()
+    except ValueError as e: # Bv. een ongeldig gebruiksregister; bij updates blijft de vorige staat staan
+        print(f"FOUT: {e}"); sys.exit(1)
+    print(f" - Eerste build: {manifest.written} geschreven, {manifest.skipped} ongewijzigd")
+    print("Wacht op wijzigingen (Ctrl+C om te stoppen). Let op: in watch-modus wordt niet gevalideerd.")
+    
+    stamps = watch_snapshot(paths, options)
+    last_change = time.perf_counter()
+    try:
+        while True:
+            time.sleep(interval)
+            current = watch_snapshot(paths, options)
+            changed = {f for f in current.keys() | stamps.keys() if current.get(f) != stamps.get(f)}
+            if not changed:
+                if site.exports_stale and time.perf_counter() - last_change >= export_delay:
+                    flush_exports(site)
+                continue
+            stamps = current
+            last_change = time.perf_counter()
+            
+            started = time.perf_counter()
+            try:
+                manifest, processed = site.update(changed)
+            except Exception as e: # Bv. een half opgeslagen TTL-bestand: vorige staat blijft staan
+                print(f"FOUT bij verwerken van {', '.join(sorted(changed))}: {e}")
+                continue
+            print(f" - {', '.join(os.path.basename(f) for f in sorted(changed))}: {processed} begrip(pen) verwerkt, "
+                  f"{manifest.written} geschreven, {manifest.removed} verwijderd "
+                  f"({(time.perf_counter() - started) * 1000:.0f} ms)")
+    except KeyboardInterrupt:
+        if site.exports_stale: flush_exports(site)
+        print("Watch gestopt.")
+
+# --- Autolink-dienst ---
+# Lokale HTTP-dienst voor andere tools (bv. datacatalogus-beschrijvingen): houdt graaf, index en
+# gecompileerde patronen warm, zodat een verzoek milliseconden kost in plaats van een koude start.
+
+SERVICE_CONFIG = {
+    "host": "127.0.0.1",           # Alleen lokaal; de dienst heeft geen authenticatie
+    "port": 8750,
+    "max_texts": 1000,             # Maximaal aantal teksten per POST /autolink
+    "max_body": 4 * 1024 * 1024,   # Bytes
+    "reload_interval": 1.0,        # Seconden tussen controles op gewijzigde TTL-bestanden
+    "timeout": 30.0,               # Seconden dat een verbinding mag stilliggen (bv. een body korter dan Content-Length)
+}
+
+class AutolinkService:
+    """Warme staat voor de autolink-dienst: store, lookup, labelindex en linker.
+    
+    Twee sloten: `lock` dekt alleen het omwisselen en het ophalen van een consistente momentopname,
+    `annotate_lock` serialiseert alles wat de gedeelde spaCy-pipeline en Matcher gebruikt (niet
+    thread-safe): het taggen en het hercompileren van de linker. Het inlezen en indexeren bij een
+    herlaadbeurt wacht dus niet op lopende verzoeken, en lookups en status niet op het taggen.
+    """
+    
+    def __init__(self, paths: ProjectPaths, options: BuildOptions):
+        self.paths = paths
+        self.options = options
+        self.lock = threading.Lock()
+        self.annotate_lock = threading.Lock()
+        self.linker: Optional[ContentLinker] = None
+        self.stamps: Dict[str, Tuple[int, int]] = {}
+        self.reload()
+
+    def reload(self) -> bool:
+        """(Her)laadt het begrippenkader als de bronbestanden gewijzigd zijn; True als er herladen is."""
+        stamps = file_snapshot(source_files(self.paths))
+        if stamps == self.stamps: return False
+        self.stamps = stamps # Ook bij een fout: pas de volgende wijziging opnieuw proberen
+        
+        started = time.perf_counter()
+        loaded = load_vocabulary(self.paths)
+        if loaded is None:
+            print(f"Geen data gevonden in {self.paths.ttl_source}"); return False
+        _, store = loaded
+        lookup = build_index(store)
+        labels = self._label_index(lookup)
+        urls = {f"/doc/{data['reference']}": uri for uri, data in lookup.items()}
+        if self.linker is None:
+            linker = make_linker(lookup, self.paths, self.options)
+        else:
+            with self.annotate_lock: # Compileren gebruikt dezelfde nlp/vocab als het taggen
+                linker = self.linker.derive(lookup)
+        
+        with self.lock:
+            self.linker, self.lookup, self.labels, self.urls = linker, lookup, labels, urls
+            self.loaded_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        print(f" - {len(lookup)} begrippen geladen ({(time.perf_counter() - started) * 1000:.0f} ms)")
+        return True
+
+    @staticmethod
+    def _label_index(lookup: dict) -> Dict[str, List[Tuple[str, str]]]:
+        """Genormaliseerd label (zoals get_normalized_sort_key) -> [(uri, labelsoort)], voorkeurstermen eerst."""
+        index: Dict[str, List[Tuple[str, str]]] = {}
+        for kind, key in (("prefLabel", "label"), ("altLabel", "alt_labels"), ("hiddenLabel", "hidden_labels")):
+            for uri, data in lookup.items():
+                labels = data[key]
+                for label in ([labels] if isinstance(labels, str) else labels):
+                    entry = (uri, kind)
+                    matches = index.setdefault(get_normalized_sort_key(label.strip()), [])
+                    if entry not in matches: matches.append(entry)
+        return index
+
+    @staticmethod
+    def _concept(lookup: dict, uri: str) -> dict:
+        data = lookup[uri]
+        return {"uri": uri, "label": data["label"], "url": f"{TTL_CONFIG['base']}/doc/{data['reference']}"}
+
+    def lookup_labels(self, labels: List[str]) -> dict:
+        with self.lock:
+            return {label: [dict(self._concept(self.lookup, uri), soort=kind)
+                            for uri, kind in self.labels.get(get_normalized_sort_key(label.strip()), [])]
+                    for label in labels}
+
+    def autolink(self, texts: List[str], title: str = "") -> List[dict]:
+        with self.lock:
+            linker, lookup, urls = self.linker, self.lookup, self.urls
+        with self.annotate_lock: # Ook de tellers in linker.stats worden alleen hier bijgewerkt
+            annotated = linker.annotate(texts, title)
+        results = []
+        for text, matches in zip(texts, annotated):
+            parts, links, last_idx = [], [], 0
+            for start, end, url in matches:
+                concept = self._concept(lookup, urls[url])
+                links.append(dict(concept, start=start, eind=end, tekst=text[start:end]))
+                parts.append(html.escape(text[last_idx:start], quote=False))
+                parts.append(f'<a href="{html.escape(concept["url"])}" class="auto-link">{html.escape(text[start:end], quote=False)}</a>')
+                last_idx = end
+            parts.append(html.escape(text[last_idx:], quote=False))
+            results.append({"html": "".join(parts), "links": links})
+        return results
+
+    def status(self) -> dict:
+        with self.lock:
+            return {"begrippen": len(self.lookup), "labels": len(self.labels), "geladen": self.loaded_at,
+                    "engine": self.linker.engine, "autolink": dict(self.linker.stats)}
+
+class AutolinkHandler(BaseHTTPRequestHandler):
+    """GET /lookup?label=..., POST /autolink en GET /status; antwoorden zijn JSON."""
+    
+    service: AutolinkService = None # Gezet door serve()
+    timeout = SERVICE_CONFIG["timeout"] # Sockettime-out, zodat een afgebroken verzoek geen thread vasthoudt
+    
+    def _send(self, status: int, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/status":
+            return self._send(200, self.service.status())
+        if url.path != "/lookup":
+            return self._send(404, {"fout": f"Onbekend pad: {url.path}"})
+        labels = parse_qs(url.query).get("label")
+        if not labels:
+            return self._send(400, {"fout": "Geef minstens één ?label=..."})
+        self._send(200, {"resultaten": self.service.lookup_labels(labels)})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/autolink":
+            return self._send(404, {"fout": f"Onbekend pad: {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length < 0: raise ValueError(length)
+        except ValueError:
+            return self._send(400, {"fout": "Ongeldige Content-Length"})
+        if length > SERVICE_CONFIG["max_body"]:
+            return self._send(413, {"fout": f"Verzoek groter dan {SERVICE_CONFIG['max_body']} bytes"})
+        try:
+            body = self.rfile.read(length)
+        except TimeoutError:
+            self.close_connection = True
+            return self._send(408, {"fout": "Body niet (volledig) ontvangen binnen de time-out"})
+        try:
+            request = json.loads(body or b"null")
+            texts = request["teksten"]
+            title = request.get("eigen_label", "")
+            if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts) or not isinstance(title, str):
+                raise ValueError("'teksten' moet een lijst strings zijn")
+        except (ValueError, KeyError, TypeError) as e:
+            return self._send(400, {"fout": f"Verwacht JSON {{\"teksten\": [...], \"eigen_label\": \"...\"}} ({e})"})
+        if len(texts) > SERVICE_CONFIG["max_texts"]:
+            return self._send(413, {"fout": f"Maximaal {SERVICE_CONFIG['max_texts']} teksten per verzoek"})
+        self._send(200, {"resultaten": self.service.autolink(texts, title)})
+
+    def log_message(self, format: str, *args):
+        pass # Geen regel per verzoek; de dienst draait naast andere tools
+
+def serve(paths: ProjectPaths, options: BuildOptions, host: str = SERVICE_CONFIG["host"], port: int = SERVICE_CONFIG["port"]):
+    """Start de autolink-dienst en herlaadt bij gewijzigde TTL-bestanden (zonder validatie)."""
+    service = AutolinkService(paths, replace(options, n_process=1))
+    handler = type("Handler", (AutolinkHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    print(f"Autolink-dienst op http://{host}:{server.server_port} (Ctrl+C om te stoppen)")
+    
+    def poll():
+        while True:
+            time.sleep(SERVICE_CONFIG["reload_interval"])
+            try:
+                service.reload()
+            except Exception as e: # Bv. een half opgeslagen TTL-bestand: vorige staat blijft staan
+                print(f"FOUT bij herladen: {e}")
+    threading.Thread(target=poll, daemon=True).start()
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Autolink-dienst gestopt.")
+    finally:
+        server.server_close()
 
 # ==============================================================================
-# 6. MAIN EXECUTION
+# 7. MAIN EXECUTION
 # ==============================================================================
 
-def main():
-    print("=== Start Generator ===")
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("root", nargs="?", default="docs", help="Doelmap van de Jekyll-site (standaard: docs)")
+    common.add_argument("--incremental", action="store_true",
+                        help="Schrijf alleen gewijzigde uitvoer en valideer alleen gewijzigde bronbestanden")
+    common.add_argument("--full-validate", action="store_true",
+                        help="Valideer altijd het hele begrippenkader, ook met --incremental (productie/CI)")
+    common.add_argument("--watch", action="store_true",
+                        help="Blijf draaien en regenereer bij wijzigingen alleen de geraakte uitvoer (alleen bij 'all')")
+    common.add_argument("--stream", action="store_true",
+                        help="Verwerk per bronbestand in plaats van één graaf in het geheugen (begrenst het piekgeheugen; "
+                             "valideert niet, pagina's in één proces)")
+    common.add_argument("--refresh-shacl", action="store_true",
+                        help="Haal het SHACL-profiel opnieuw op in plaats van de gecachte kopie te gebruiken")
+    common.add_argument("--batch-size", type=int, default=NLP_CONFIG["batch_size"],
+                        help="Aantal teksten per spaCy-batch bij het autolinken")
+    common.add_argument("--nlp-processes", type=int, default=NLP_CONFIG["n_process"],
+                        help="Aantal processen voor spaCy's nlp.pipe")
+    common.add_argument("--jobs", type=int, default=1,
+                        help="Aantal processen voor het parsen van TTL-bestanden en het verwerken van begrippenpagina's")
+    common.add_argument("--engine", choices=ContentLinker.ENGINES, default=NLP_CONFIG["engine"],
+                        help="Autolink-engine: spaCy Matcher of token-trie (leftmost-longest)")
+    common.add_argument("--link-labels", nargs="+", choices=("prefLabel", "altLabel", "hiddenLabel"),
+                        default=list(NLP_CONFIG["link_labels"]), help="Labelsoorten die autolinks opleveren")
+    common.add_argument("--usages", nargs="+", metavar="PAD", default=list(USAGE_CONFIG["registers"]),
+                        help="Gebruiksregister(s) (JSON, glob-patronen toegestaan) voor de tabel 'gebruik in modellen'")
+    common.add_argument("--profile", metavar="PAD",
+                        help="Schrijf een JSON-rapport met tijd per fase, piekgeheugen, aantallen en de traagste begrippen")
+    common.add_argument("--profile-top", type=int, default=10, metavar="N", help="Aantal traagste begrippen in het rapport")
+    common.add_argument("--cprofile", metavar="PAD", help="Schrijf een cProfile/pstats-dump van de hele run")
+
+    parser = argparse.ArgumentParser(description="Genereert de begrippenkader-site uit de TTL-bronnen.")
+    commands = parser.add_subparsers(dest="command", metavar="COMMANDO")
+    helps = {
+        "validate": "Alleen SHACL-validatie (snel: laadt geen NLP-bibliotheken)",
+        "index":    "Alfabetische nav, navigatieboom en zoekindex",
+        "export":   "TTL/N-Triples/JSON-LD/JSON-exports",
+        "pages":    "Homepage, begrippenpagina's (met autolinks) en aliassen",
+        "all":      "Valideren en alles genereren (standaard)",
+    }
+    for name in COMMANDS:
+        commands.add_parser(name, parents=[common], help=helps[name])
+    service = commands.add_parser("serve", parents=[common], help="Lokale HTTP-dienst: POST /autolink en GET /lookup?label=")
+    service.add_argument("--host", default=SERVICE_CONFIG["host"])
+    service.add_argument("--port", type=int, default=SERVICE_CONFIG["port"])
+    
+    # Zonder commando (oude aanroep `generate.py docs --incremental`): 'all'
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or (argv[0] not in COMMANDS and argv[0] not in ("serve", "-h", "--help")):
+        argv.insert(0, "all")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        try:
+            profiler.runcall(run, args)
+        finally:
+            profiler.dump_stats(args.cprofile)
+            print(f"cProfile-dump: {args.cprofile} (bekijk met: python -m pstats {args.cprofile})")
+    else:
+        run(args)
+
+def run(args: argparse.Namespace):
+    print(f"=== Start Generator ({args.command}) ===")
     
     # Setup
-    paths = ProjectPaths(root=sys.argv[1] if len(sys.argv) > 1 else "docs")
-    graph = Graph()
+    paths = ProjectPaths(root=args.root)
+    options = BuildOptions(incremental=args.incremental, batch_size=args.batch_size, n_process=args.nlp_processes,
+                           jobs=args.jobs, engine=args.engine, link_labels=tuple(args.link_labels),
+                           usage_registers=tuple(args.usages))
+    if args.watch:
+        if args.command != "all":
+            print("FOUT: --watch kan alleen met 'all'."); sys.exit(1)
+        watch(paths, options); return
+    if args.command == "serve":
+        serve(paths, options, args.host, args.port); return
+    
+    if args.stream and args.command == "validate":
+        print("FOUT: SHACL-validatie heeft de volledige graaf nodig; --stream kan niet met 'validate'."); sys.exit(1)
+    
+    profile = BuildProfile(enabled=bool(args.profile), top=args.profile_top)
     
     # Load
-    files = glob.glob(os.path.join(paths.ttl_source, "*.ttl"))
-    if not files:
+    source = None
+    with profile.phase("laden"):
+        if args.stream:
+            loaded = load_skeleton(paths)
+            if loaded is not None: store, source, triples = loaded; graph = None
+        else:
+            loaded = load_vocabulary(paths, jobs=args.jobs)
+            if loaded is not None: graph, store = loaded; triples = len(graph)
+    if loaded is None:
         print(f"Geen data gevonden in {paths.ttl_source}"); return
-    for f in files: graph.parse(f, format="turtle")
-    print(f"{len(graph)} triples ingeladen.")
+    try:
+        store.usages = load_usages(options.usage_registers)
+    except ValueError as e:
+        print(f"FOUT: {e}"); sys.exit(1)
+    print(f"{triples} triples {'gelezen (per bronbestand)' if args.stream else 'ingeladen'}, "
+          f"gebruik in modellen voor {len(store.usages)} URI's.")
+    profile.counts.update(bestanden=len(source_files(paths)), triples=triples, concepten=len(store.concepts))
 
     # Validate
-    valid, _, report = validate(graph, shacl_graph=TTL_CONFIG["shacl_profile"], inference='rdfs')
-    if not valid:
-        print("!!! SHACL-validatiefout !!!\n", report)
-        sys.exit(1)
-    print("SHACL-validatie geslaagd.")
+    if args.stream and args.command == "all":
+        print("LET OP: in de streamingmodus wordt niet gevalideerd; draai 'generate.py validate' apart.")
+    elif args.command in ("validate", "all"):
+        with profile.phase("validatie"):
+            valid, report = validate_sources(graph, paths, incremental=args.incremental and not args.full_validate,
+                                             refresh_shapes=args.refresh_shacl)
+        if not valid:
+            print("!!! SHACL-validatiefout !!!\n", report)
+            sys.exit(1)
+        print("SHACL-validatie geslaagd.")
 
     # Generate
-    generate_site(graph, paths)
+    lookup = generate_site(graph, store, paths, options, profile, COMMANDS[args.command], source) if COMMANDS[args.command] else {}
+    if args.profile: profile.save(args.profile, lookup)
     print("=== Klaar! ===")
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
-import os, shutil, sys
-from invoke import task
+import os, shutil, sys, json, time, hashlib
+from invoke import task, Exit
 
 # ==============================================================================
 # CONFIGURATIE
@@ -8,10 +8,80 @@ from invoke import task
 DOCS_DIR = "docs"
 STAGING_DIR = "_staging"
 SITE_DIR = "_site"
+# Gebruiksregisters (gebruik van begrippen in modellen); generate.py leest ze lokaal uit registers/
+REGISTERS_DIR = "registers"
+REGISTER_URLS = ["https://netbeheer-nederland.github.io/stelsel/registers/concept_usages.json"]
+PROFILE_REPORT = "build-profiel.json" # Naast _site: tijd per fase, geheugen, traagste begrippen
+SYNC_MANIFEST = os.path.join(STAGING_DIR, ".sync-manifest.json") # Jekyll negeert dotfiles
+GENERATE_MANIFEST = os.path.join(STAGING_DIR, ".generate-manifest.json") # Geschreven aan het eind van een build
 
 PYTHON = sys.executable
 JEKYLL = "bundle exec jekyll"
 
+# ==============================================================================
+# HULPFUNCTIES
+# ==============================================================================
+
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""): h.update(chunk)
+    return h.hexdigest()
+
+def sync_tree(src, dst, manifest_path):
+    """Synchroniseert `src` naar `dst` op basis van content-hashes.
+    
+    Alleen gewijzigde bestanden worden gekopieerd (mét bron-mtime), verwijderde bronbestanden
+    verdwijnen uit `dst`, en onaangeroerde bestanden houden hun mtime, zodat
+    `jekyll --incremental` alleen de echte wijzigingen opnieuw verwerkt. Bestanden in `dst`
+    die niet uit `src` komen (de generator-uitvoer) blijven staan.
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as f: previous = json.load(f)
+    except (FileNotFoundError, ValueError):
+        previous = {}
+    
+    current, copied, removed = {}, [], []
+    for folder, _, files in os.walk(src):
+        for name in files:
+            path = os.path.join(folder, name)
+            key = os.path.relpath(path, src).replace(os.sep, "/")
+            target = os.path.join(dst, key)
+            stat = os.stat(path)
+            entry = previous.get(key)
+            
+            # Snelle route: zelfde mtime/grootte als vorige keer -> hash niet opnieuw berekenen
+            if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                digest = entry["sha256"]
+            else:
+                digest = _file_hash(path)
+            current[key] = {"sha256": digest, "mtime": stat.st_mtime_ns, "size": stat.st_size}
+            
+            if entry and entry["sha256"] == digest and os.path.exists(target): continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copy2(path, target)
+            copied.append(key)
+    
+    for key in previous.keys() - current.keys():
+        try:
+            os.remove(os.path.join(dst, key))
+            removed.append(key)
+        except FileNotFoundError:
+            pass
+    
+    os.makedirs(dst, exist_ok=True)
+    with open(manifest_path, "w", encoding="utf-8") as f: json.dump(current, f, indent=1, sort_keys=True)
+    return copied, removed, len(current) - len(copied)
+
+def sync_docs():
+    print(f"📂 Content synchroniseren: {DOCS_DIR} -> {STAGING_DIR}")
+    
+    # Alleen gewijzigde bestanden kopiëren; werkt ook terwijl Jekyll draait
+    copied, removed, unchanged = sync_tree(DOCS_DIR, STAGING_DIR, SYNC_MANIFEST)
+    for key in copied: print(f"   + {key}")
+    for key in removed: print(f"   - {key}")
+    print(f"   {len(copied)} gekopieerd, {len(removed)} verwijderd, {unchanged} ongewijzigd.")
+
 # ==============================================================================
 # TAKEN
 # ==============================================================================
@@ -31,21 +101,55 @@ def setup(c):
         c.run(f"{PYTHON} -m spacy download nl_core_news_sm")
     print("✅ Klaar.")
 
-@task
-def update(c):
+@task(help={"profile": "Schrijf een profielrapport (JSON) naar dit pad",
+            "full_validate": "Valideer het hele begrippenkader in plaats van alleen de gewijzigde bestanden"})
+def update(c, profile=None, full_validate=False):
     """2. Verversen: Draai dit om wijzigingen in data door te voeren."""
-    print(f"📂 Content kopiëren: {DOCS_DIR} -> {STAGING_DIR}")
-    
-    # dirs_exist_ok=True zorgt dat we kunnen overschrijven terwijl Jekyll draait
-    shutil.copytree(DOCS_DIR, STAGING_DIR, dirs_exist_ok=True)
+    sync_docs()
     
     print("🔮 Genereren start...")
-    res = c.run(f"{PYTHON} generate.py {STAGING_DIR}", warn=True)
+    extra = f" --profile {profile}" if profile else ""
+    if full_validate: extra += " --full-validate"
+    res = c.run(f"{PYTHON} generate.py all {STAGING_DIR} --incremental{extra}", warn=True)
     
     if res.failed:
         print("❌ FOUT: Generatie mislukt."); 
     else:
         print("✅ Data bijgewerkt.")
+    return not res.failed
+
+@task
+def validate(c):
+    """Alleen SHACL-validatie van begrippenkader/ (snel, zonder NLP; geschikt als pre-commit-controle)."""
+    res = c.run(f"{PYTHON} generate.py validate {STAGING_DIR} --incremental", warn=True)
+    if res.failed:
+        raise Exit("❌ Validatie mislukt.", code=1)
+
+@task(help={"port": "Poort op localhost (standaard 8750)"})
+def service(c, port=8750):
+    """Autolink-dienst: POST /autolink en GET /lookup?label= voor andere tools; herlaadt bij TTL-wijzigingen."""
+    c.run(f"{PYTHON} generate.py serve --port {port}")
+
+@task
+def registers(c):
+    """Haalt de gebruiksregisters op naar registers/ (voor de tabel 'gebruik in modellen')."""
+    from urllib.request import urlopen
+    os.makedirs(REGISTERS_DIR, exist_ok=True)
+    for url in REGISTER_URLS:
+        target = os.path.join(REGISTERS_DIR, url.rsplit("/", 1)[-1])
+        try:
+            with urlopen(url, timeout=30) as response:
+                content = response.read()
+            json.loads(content) # Geen halve of foutpagina over een goede kopie heen schrijven
+        except (OSError, ValueError) as e:
+            if not os.path.exists(target):
+                raise Exit(f"❌ {url} niet opgehaald ({e}) en geen eerdere kopie in {REGISTERS_DIR}/.", code=1)
+            print(f"⚠️  {url} niet opgehaald ({e}); bestaande kopie blijft staan.")
+            continue
+        with open(f"{target}.tmp", "wb") as f:
+            f.write(content)
+        os.replace(f"{target}.tmp", target)
+        print(f"📥 {url} -> {target}")
 
 @task
 def serve(c):
@@ -60,12 +164,104 @@ def serve(c):
     print("\n🌍 Server start... (Ctrl+C om te stoppen)")
     c.run(f"{JEKYLL} serve -s {STAGING_DIR} -d {SITE_DIR} --livereload --incremental --open-url")
 
+@task
+def watch(c):
+    """Starten met watch-modus: TTL- en templatewijzigingen worden direct (alleen voor geraakte pagina's) doorgevoerd."""
+    print("🧹 Opruimen...")
+    shutil.rmtree(STAGING_DIR, ignore_errors=True)
+    sync_docs()
+    
+    # De watch-modus doet zelf de eerste volledige build; Jekyll start pas als die klaar is
+    print("🔮 Genereren start (watch-modus)...")
+    generator = c.run(f"{PYTHON} generate.py all {STAGING_DIR} --watch", asynchronous=True)
+    try:
+        while not os.path.exists(GENERATE_MANIFEST):
+            if generator.runner.process_is_finished:
+                raise Exit("❌ FOUT: Generatie mislukt.", code=1)
+            time.sleep(0.2)
+        
+        print("\n🌍 Server start... (Ctrl+C om te stoppen)")
+        c.run(f"{JEKYLL} serve -s {STAGING_DIR} -d {SITE_DIR} --livereload --incremental --open-url")
+    finally:
+        generator.runner.kill()
+
 @task
 def build(c):
-    """Productie build (voor CI/CD)."""
-    update(c)
+    """Productie build (voor CI/CD), met profielrapport naast _site."""
+    # Uitvoer incrementeel, maar altijd volledig valideren: ook verwijzingen vanuit ongewijzigde bestanden
+    if not update(c, profile=PROFILE_REPORT, full_validate=True):
+        raise Exit("❌ Build afgebroken: generatie of validatie mislukt.", code=1)
     c.run(f"{JEKYLL} build -s {STAGING_DIR} -d {SITE_DIR}")
 
+@task(name="check-autolink")
+def check_autolink(c):
+    """Controle: de trie-engine linkt het hele begrippenkader exact zoals de spaCy Matcher."""
+    import generate
+    
+    _, store = generate.load_vocabulary(generate.ProjectPaths(root=STAGING_DIR))
+    lookup = generate.build_index(store)
+    concepts = store.concepts
+    
+    results = {}
+    for engine in generate.ContentLinker.ENGINES:
+        print(f"🔗 Autolinken met engine '{engine}'...")
+        linker = generate.ContentLinker(lookup, engine=engine)
+        results[engine] = generate.process_concepts(store, concepts, lookup, linker)
+    
+    verschillen = [a["reference"] for a, b in zip(*results.values()) if a != b]
+    if verschillen:
+        raise Exit(f"❌ Engines verschillen bij {len(verschillen)} begrippen: {', '.join(verschillen)}", code=1)
+    print(f"✅ Identieke autolinks voor {len(concepts)} begrippen.")
+
+@task(name="check-registers")
+def check_registers(c):
+    """Controle: de build faalt op een placeholder-register en op een register met een ongeldige regel."""
+    import tempfile
+    import generate
+
+    uri = "https://begrippen.netbeheernederland.nl/id/voorbeeld"
+    row = {"model_name": "Model", "model_url": "", "element_name": "Element", "element_url": "", "element_type": "class"}
+    cases = {
+        "placeholder": {"TODO": "URL van het gebruiksregister invullen"},
+        "ongeldige regel": {uri: [row, {"model_name": "Model zonder element"}]},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        good = os.path.join(tmp, "goed.json")
+        with open(good, "w", encoding="utf-8") as f: json.dump({uri: [row]}, f)
+        if generate.load_usages((good,)) != {uri: [row]}:
+            raise Exit("❌ Een geldig gebruiksregister wordt niet correct ingelezen.", code=1)
+
+        for name, register in cases.items():
+            path = os.path.join(tmp, f"{name.replace(' ', '-')}.json")
+            with open(path, "w", encoding="utf-8") as f: json.dump(register, f)
+            res = c.run(f"{PYTHON} generate.py index {os.path.join(tmp, 'site')} --usages {path}", warn=True, hide=True)
+            if not res.failed or "gebruiksregister" not in res.stdout:
+                raise Exit(f"❌ De build faalt niet op een register met een {name}.", code=1)
+            print(f"✅ Build faalt op een register met een {name}.")
+
+@task(name="check-stream")
+def check_stream(c):
+    """Controle: --stream blijft bij twee groottes binnen de absolute RSS-grens, met dezelfde uitvoer."""
+    import tempfile
+    import benchmark
+
+    sizes = benchmark.BENCH_CONFIG["stream_sizes"]
+    with tempfile.TemporaryDirectory() as tmp:
+        # De uitvoer vergelijken (incl. pages) op de kleinste grootte; de grens geldt op allebei
+        results = [benchmark.bench_stream(size, tmp, benchmark.BENCH_CONFIG["seed"], compare=size == min(sizes)) for size in sizes]
+    failed = [str(result["begrippen"]) for result in results if not result["geslaagd"]]
+    if failed:
+        raise Exit(f"❌ --stream faalt bij {', '.join(failed)} begrippen (zie hierboven).", code=1)
+    print(f"✅ --stream binnen de RSS-grens bij {', '.join(map(str, sizes))} begrippen.")
+
+@task(help={"sizes": "Kommagescheiden aantallen begrippen, bv. 1000,10000", "baseline": "Eerder resultaatbestand om mee te vergelijken",
+            "startup": "Alleen de opstarttijd per subcommando meten"})
+def benchmark(c, sizes="1000,10000,100000", baseline=None, startup=False):
+    """Benchmark: meet elke generatorfase op synthetische begrippenkaders (offline)."""
+    extra = f" --baseline {baseline}" if baseline else ""
+    if startup: extra += " --startup"
+    c.run(f"{PYTHON} benchmark.py --sizes {sizes}{extra}")
+
 # ==============================================================================
 # INTERACTIEF MENU
 # ==============================================================================
@@ -77,6 +273,7 @@ def menu(c):
         print(" [1] Setup  (Installeren)")
         print(" [2] Start  (Website bekijken)")
         print(" [3] Update (Verversen tijdens draaien)")
+        print(" [4] Watch  (Website bekijken, wijzigingen direct doorvoeren)")
         print(" [Q] Stop")
         
         try:
@@ -87,4 +284,5 @@ def menu(c):
         if choice == '1': setup(c)
         elif choice == '2': serve(c)
         elif choice == '3': update(c)
+        elif choice == '4': watch(c)
         elif choice == 'q': break